@@ -0,0 +1,26 @@
+"""add composite index for house cursor pagination
+
+Revision ID: a1c3e5f70001
+Revises: f0a0b0c00000
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c3e5f70001'
+down_revision: Union[str, None] = 'f0a0b0c00000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_house_category_house_id', 'house', ['category', 'house_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_house_category_house_id', table_name='house')
@@ -0,0 +1,41 @@
+"""add normalized phone columns with covering login indexes
+
+Revision ID: a6b8d0e20006
+Revises: e5a7c9d10005
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6b8d0e20006'
+down_revision: Union[str, None] = 'e5a7c9d10005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ('"user"', 'admin'):
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN phone_normalized varchar "
+            "GENERATED ALWAYS AS (regexp_replace(phone_no, '[^0-9+]', '', 'g')) STORED"
+        )
+    op.create_index(
+        'ix_user_phone_normalized', 'user', ['phone_normalized'],
+        postgresql_include=['user_id', 'password'],
+    )
+    op.create_index(
+        'ix_admin_phone_normalized', 'admin', ['phone_normalized'],
+        postgresql_include=['admin_id', 'password', 'admin_type'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_admin_phone_normalized', table_name='admin')
+    op.drop_index('ix_user_phone_normalized', table_name='user')
+    op.drop_column('admin', 'phone_normalized')
+    op.drop_column('user', 'phone_normalized')
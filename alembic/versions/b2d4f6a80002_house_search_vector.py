@@ -0,0 +1,39 @@
+"""add full text search column and GIN index to house
+
+Revision ID: b2d4f6a80002
+Revises: a1c3e5f70001
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d4f6a80002'
+down_revision: Union[str, None] = 'a1c3e5f70001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A stored generated column is computed for every existing row when it is added,
+    # so this also backfills the search vector for the current catalogue.
+    op.execute(
+        """
+        ALTER TABLE house ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            to_tsvector('english', coalesce(description, '') || ' ' || coalesce(address, '') || ' '
+                || coalesce(location, '') || ' ' || coalesce(facility, ''))
+        ) STORED
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_house_search_vector ON house USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_house_search_vector', table_name='house')
+    op.drop_column('house', 'search_vector')
@@ -0,0 +1,31 @@
+"""add indexed expiry column to vip_status
+
+Revision ID: c3e5a7b90003
+Revises: b2d4f6a80002
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5a7b90003'
+down_revision: Union[str, None] = 'b2d4f6a80002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE vip_status ADD COLUMN expires_at timestamp "
+        "GENERATED ALWAYS AS (created_date + duration * interval '1 day') STORED"
+    )
+    op.create_index('ix_vip_status_expires_at', 'vip_status', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_vip_status_expires_at', table_name='vip_status')
+    op.drop_column('vip_status', 'expires_at')
@@ -0,0 +1,53 @@
+"""add job table for background jobs
+
+Revision ID: c8d0f2a40008
+Revises: b7c9e1f30007
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d0f2a40008'
+down_revision: Union[str, None] = 'b7c9e1f30007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job',
+        sa.Column('id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('payload', postgresql.JSONB(), nullable=True),
+        sa.Column(
+            'status',
+            sa.Enum('queued', 'running', 'done', 'failed', name='job_status_enum'),
+            nullable=False,
+            server_default='queued',
+        ),
+        sa.Column('run_at', sa.DateTime(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('locked_by', sa.String(100), nullable=True),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        'ix_job_queued_run_at', 'job', ['run_at'], postgresql_where=sa.text("status = 'queued'")
+    )
+    op.create_index('ix_job_name_created_at', 'job', ['name', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_name_created_at', table_name='job')
+    op.drop_index('ix_job_queued_run_at', table_name='job')
+    op.drop_table('job')
+    sa.Enum(name='job_status_enum').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,44 @@
+"""make the normalized phone login indexes unique
+
+Revision ID: d9f1b3c50009
+Revises: c8d0f2a40008
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f1b3c50009'
+down_revision: Union[str, None] = 'c8d0f2a40008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fails if two accounts already share a normalized number; merge or renumber them first
+    op.drop_index('ix_user_phone_normalized', table_name='user')
+    op.create_index(
+        'ix_user_phone_normalized', 'user', ['phone_normalized'], unique=True,
+        postgresql_include=['user_id', 'password'],
+    )
+    op.drop_index('ix_admin_phone_normalized', table_name='admin')
+    op.create_index(
+        'ix_admin_phone_normalized', 'admin', ['phone_normalized'], unique=True,
+        postgresql_include=['admin_id', 'password', 'admin_type'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_admin_phone_normalized', table_name='admin')
+    op.create_index(
+        'ix_admin_phone_normalized', 'admin', ['phone_normalized'],
+        postgresql_include=['admin_id', 'password', 'admin_type'],
+    )
+    op.drop_index('ix_user_phone_normalized', table_name='user')
+    op.create_index(
+        'ix_user_phone_normalized', 'user', ['phone_normalized'],
+        postgresql_include=['user_id', 'password'],
+    )
@@ -0,0 +1,43 @@
+"""add admin_stats table and indexes for dashboard aggregates
+
+Revision ID: e5a7c9d10005
+Revises: d4f6b8c00004
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9d10005'
+down_revision: Union[str, None] = 'd4f6b8c00004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'admin_stats',
+        sa.Column('admin_id', sa.Integer(), sa.ForeignKey('admin.admin_id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('total_houses', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pending_visits', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('success_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('failure_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pending_reports', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_revenue', sa.Numeric(14, 2), nullable=False, server_default='0'),
+    )
+    op.create_index('ix_house_assigned_for', 'house', ['assigned_for'])
+    op.create_index('ix_invitation_house_id', 'invitation', ['house_id'])
+    op.create_index('ix_success_report_admin_id', 'success_report', ['admin_id'])
+    op.create_index('ix_failure_report_admin_id', 'failure_report', ['admin_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_failure_report_admin_id', table_name='failure_report')
+    op.drop_index('ix_success_report_admin_id', table_name='success_report')
+    op.drop_index('ix_invitation_house_id', table_name='invitation')
+    op.drop_index('ix_house_assigned_for', table_name='house')
+    op.drop_table('admin_stats')
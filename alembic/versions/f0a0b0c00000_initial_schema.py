@@ -0,0 +1,146 @@
+"""initial schema
+
+Revision ID: f0a0b0c00000
+Revises: 
+Create Date: 2026-10-18 08:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f0a0b0c00000'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by the old create_all() at import already have these tables:
+    # run `alembic stamp f0a0b0c00000` on them before upgrading.
+    op.create_table(
+        'user',
+        sa.Column('user_id', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('phone_no', sa.String()),
+        sa.Column('password', sa.String(), nullable=False),
+        sa.Column('invitation_code', sa.String(), unique=True),
+        sa.Column('invited_by', sa.String(), nullable=True),
+    )
+    op.create_index('ix_user_user_id', 'user', ['user_id'])
+    op.create_index('ix_user_phone_no', 'user', ['phone_no'], unique=True)
+
+    op.create_table(
+        'admin',
+        sa.Column('admin_id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('name', sa.String(255), nullable=False),
+        sa.Column('phone_no', sa.String(20), nullable=False, unique=True),
+        sa.Column('id_front', sa.String(255), nullable=False),
+        sa.Column('id_back', sa.String(255), nullable=False),
+        sa.Column('invitation_code', sa.String(255), unique=True),
+        sa.Column('admin_type', sa.Enum('super-admin', 'admin', name='admin_type_enum'), nullable=False),
+        sa.Column('password', sa.String(255), nullable=False),
+    )
+
+    op.create_table(
+        'area',
+        sa.Column('code', sa.Integer(), primary_key=True),
+        sa.Column('name', sa.String(255), nullable=False, unique=True),
+    )
+
+    op.create_table(
+        'broker',
+        sa.Column('broker_id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('name', sa.String(255), nullable=False),
+        sa.Column('phone_number', sa.String(20), nullable=False, unique=True),
+    )
+
+    op.create_table(
+        'house',
+        sa.Column('house_id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('category', sa.Enum('sell', 'rent', name='category_enum'), nullable=False),
+        sa.Column('area_code', sa.Integer(), sa.ForeignKey('area.code', ondelete='CASCADE'), nullable=False),
+        sa.Column('location', sa.String(255), nullable=False),
+        sa.Column('address', sa.String(255), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('condition', sa.Enum('fairly used', 'newly built', 'old and renovated', name='condition_enum'), nullable=True),
+        sa.Column('bedroom', sa.Integer(), nullable=False),
+        sa.Column('toilets', sa.Integer(), nullable=False),
+        sa.Column('listed_by', sa.Enum('agent', 'owner', name='listed_by_enum'), nullable=True, server_default='owner'),
+        sa.Column('property_type', sa.Enum('apartment', 'condominium', name='property_type_enum'), nullable=False),
+        sa.Column('furnish_status', sa.Enum('furnished', 'semi furnished', 'unfurnished', name='furnish_status_enum'), nullable=False),
+        sa.Column('bathroom', sa.Integer(), nullable=False),
+        sa.Column('facility', sa.Text(), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('price', sa.Numeric(10, 2), nullable=False),
+        sa.Column('negotiability', sa.Enum('open to negotiation', 'not', name='negotiability_enum'), nullable=False),
+        sa.Column('parking_space', sa.Boolean(), nullable=False),
+        sa.Column('assigned_for', sa.Integer(), sa.ForeignKey('admin.admin_id'), nullable=True),
+        sa.Column('owner', sa.Integer(), sa.ForeignKey('user.user_id', ondelete='SET NULL'), nullable=True),
+        sa.Column('status', sa.Enum('pending', 'available', 'rented', 'sold', name='status_enum'), nullable=False),
+        sa.Column('image_urls', sa.ARRAY(sa.Text()), nullable=True),
+        sa.Column('video', sa.String(255), nullable=True),
+        sa.Column('posted_by', sa.Integer(), sa.ForeignKey('broker.broker_id'), nullable=True),
+    )
+
+    op.create_table(
+        'vip_status',
+        sa.Column('vip_id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('house_id', sa.Integer(), sa.ForeignKey('house.house_id', ondelete='CASCADE'), nullable=False, unique=True),
+        sa.Column('created_date', sa.DateTime(), nullable=False),
+        sa.Column('duration', sa.Integer(), nullable=False),
+        sa.Column('price', sa.Numeric(10, 2), nullable=False),
+    )
+
+    op.create_table(
+        'invitation',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.user_id'), nullable=False),
+        sa.Column('house_id', sa.Integer(), sa.ForeignKey('house.house_id'), nullable=False),
+        sa.Column('request_date', sa.DateTime()),
+        sa.Column('visited_date', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.Enum('seen', 'not seen', name='visit_request_status_enum'), nullable=False),
+    )
+
+    op.create_table(
+        'success_report',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('admin_id', sa.Integer(), sa.ForeignKey('admin.admin_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('invitation_id', sa.Integer(), sa.ForeignKey('invitation.id'), nullable=False),
+        sa.Column('price', sa.Numeric(10, 2), nullable=False),
+        sa.Column('type', sa.Enum('rent', 'sell', name='report_type_enum'), nullable=False),
+        sa.Column('commission', sa.Numeric(10, 2), nullable=False),
+        sa.Column('transaction_photo', sa.String(255), nullable=False),
+    )
+
+    op.create_table(
+        'failure_report',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('admin_id', sa.Integer(), sa.ForeignKey('admin.admin_id'), nullable=False),
+        sa.Column('invitation_id', sa.Integer(), sa.ForeignKey('invitation.id'), nullable=False),
+        sa.Column('reason', sa.Text(), nullable=False),
+    )
+
+    op.create_table(
+        'admin_location',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('admin_id', sa.Integer(), sa.ForeignKey('admin.admin_id'), nullable=False),
+        sa.Column('area_code', sa.Integer(), sa.ForeignKey('area.code'), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    for table in (
+        'admin_location', 'failure_report', 'success_report', 'invitation', 'vip_status',
+        'house', 'broker', 'area', 'admin', 'user',
+    ):
+        op.drop_table(table)
+    for enum in (
+        'report_type_enum', 'visit_request_status_enum', 'status_enum', 'negotiability_enum',
+        'furnish_status_enum', 'property_type_enum', 'listed_by_enum', 'condition_enum',
+        'category_enum', 'admin_type_enum',
+    ):
+        sa.Enum(name=enum).drop(op.get_bind(), checkfirst=True)
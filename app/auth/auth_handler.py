@@ -1,16 +1,24 @@
+import asyncio
 import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from dotenv import load_dotenv
 from typing import Optional
 from fastapi import HTTPException, status
+from app.auth.revocation import revocation_list
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "15"))
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -26,29 +34,135 @@ def verify_password(plain_password, hashed_password):
     """
     return pwd_context.verify(plain_password, hashed_password)
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+# bcrypt releases the GIL while hashing, so a small dedicated thread pool runs hashes in
+# parallel without tying up the request threadpool. Calls beyond the workers plus the
+# queue limit are rejected with 429 instead of waiting.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_hash_lock = threading.Lock()
+_hash_pending = 0
+_hash_rejected = 0
+_hash_timings = deque(maxlen=1000)  # (queue wait, hash time) in seconds
+
+
+def _timed(fn, queued_at, *args):
+    started = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        _hash_timings.append((started - queued_at, time.perf_counter() - started))
+
+
+async def _run_password_job(fn, *args):
+    global _hash_pending, _hash_rejected
+    with _hash_lock:
+        if _hash_pending >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE:
+            _hash_rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many password operations in progress, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        _hash_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, _timed, fn, time.perf_counter(), *args)
+    finally:
+        with _hash_lock:
+            _hash_pending -= 1
+
+
+async def get_password_hash_async(password):
+    """
+    Hash a password on the bounded password executor.
     """
-    Create a JWT access token.
+    return await _run_password_job(get_password_hash, password)
+
+
+async def verify_password_async(plain_password, hashed_password):
+    """
+    Verify a password against a hash on the bounded password executor.
+    """
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+def get_password_hash_metrics():
+    """
+    Queue depth, rejections and recent queue wait / hash latency in milliseconds.
+    """
+    timings = list(_hash_timings)
+
+    def summary(values):
+        if not values:
+            return {"p50_ms": 0, "p95_ms": 0, "max_ms": 0}
+        values = sorted(values)
+        return {
+            "p50_ms": round(values[len(values) // 2] * 1000, 1),
+            "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))] * 1000, 1),
+            "max_ms": round(values[-1] * 1000, 1),
+        }
+
+    return {
+        "workers": PASSWORD_HASH_WORKERS,
+        "max_queue": PASSWORD_HASH_MAX_QUEUE,
+        "in_flight": _hash_pending,
+        "rejected": _hash_rejected,
+        "samples": len(timings),
+        "queue_wait": summary([wait for wait, _ in timings]),
+        "hash_time": summary([duration for _, duration in timings]),
+    }
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None, token_type: str = "access"):
+    """
+    Create a JWT access token. Every token gets a jti so it can be revoked.
     """
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex, "type": token_type})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def decode_token(token: str):
+def create_refresh_token(data: dict):
     """
-    Decode a JWT token.
+    Create a long-lived JWT refresh token, accepted only by /auth/refresh.
     """
+    return create_access_token(data, timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS), token_type="refresh")
+
+def decode_token(token: str, token_type: str = "access"):
+    """
+    Decode a JWT token and reject it if it is of another type or has been revoked.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
+        raise credentials_exception
+
+    # Tokens issued before revocation support carry neither claim and are access tokens
+    if payload.get("type", "access") != token_type:
+        raise credentials_exception
+    jti = payload.get("jti")
+    if jti and revocation_list.is_revoked(jti):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
+            detail="Token has been revoked",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return payload
+
+def revoke_token(db, payload: dict) -> bool:
+    """
+    Revoke a decoded token until its expiry. Returns False if it was already revoked or has no jti.
+    """
+    if not payload.get("jti"):
+        return False
+    return revocation_list.revoke(db, payload["jti"], datetime.utcfromtimestamp(payload["exp"]))
@@ -28,3 +28,60 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         )
     return user
     
+
+class Principal:
+    """
+    The caller as described by the signed token claims. user_id or admin_id is
+    available without a query; any other attribute loads the User or Admin row
+    on first access.
+    """
+
+    def __init__(self, subject_id: int, role: str, db: Session):
+        self.id = subject_id
+        self.role = role
+        self.is_admin = role != "user"
+        if self.is_admin:
+            self.admin_id = subject_id
+            self.admin_type = role
+        else:
+            self.user_id = subject_id
+        self._db = db
+        self._row = None
+
+    def load(self):
+        """
+        Get the User or Admin row for this principal.
+        """
+        if self._row is None:
+            model = Admin if self.is_admin else User
+            self._row = self._db.get(model, self.id)
+            if self._row is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="User not found",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+        return self._row
+
+    def __getattr__(self, name):
+        # Only reached for attributes not set in __init__, i.e. profile fields.
+        # The id of the other role is missing without a lookup so hasattr() checks stay free.
+        if name.startswith("_") or name in ("user_id", "admin_id", "admin_type"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+
+def get_current_principal(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    """
+    Get the caller from the JWT claims alone, without querying the database.
+    """
+    payload = decode_token(token)
+    subject = payload.get("sub")
+    role = payload.get("role")
+    if subject is None or role is None or not str(subject).isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return Principal(int(subject), role, db)
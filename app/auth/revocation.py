@@ -0,0 +1,152 @@
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import RevokedToken
+from app.models.db import utcnow
+from app.services.jobs import periodic_job
+
+logger = logging.getLogger(__name__)
+
+# How often each worker pulls new revocations, and how often it rebuilds its filter to drop expired ones
+REVOCATION_REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS", "5"))
+REVOCATION_REBUILD_SECONDS = float(os.getenv("REVOCATION_REBUILD_SECONDS", "3600"))
+# Each pull re-reads revocations this far behind the newest one seen, so a row that commits
+# after a later one is still picked up
+REVOCATION_PULL_OVERLAP_SECONDS = float(os.getenv("REVOCATION_PULL_OVERLAP_SECONDS", "60"))
+REVOCATION_FALSE_POSITIVE_RATE = 0.001
+REVOCATION_PURGE_SECONDS = float(os.getenv("REVOCATION_PURGE_SECONDS", "3600"))
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings using double hashing of one blake2b digest.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = REVOCATION_FALSE_POSITIVE_RATE):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationList:
+    """
+    Per-worker view of the revoked_token table. A token that is not in the Bloom filter
+    is accepted with no I/O; a filter hit is confirmed against the table.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._pulled_until = None
+        self._built_at = 0.0
+        self._refreshed_at = 0.0
+
+    def _rebuild(self, db: Session) -> None:
+        now = utcnow()
+        rows = db.execute(select(RevokedToken.jti, RevokedToken.revoked_at).where(RevokedToken.expires_at > now)).all()
+        bloom = BloomFilter(max(10000, len(rows) * 2))
+        for jti, _ in rows:
+            bloom.add(jti)
+        self._pulled_until = max((revoked_at for _, revoked_at in rows), default=None)
+        self._filter = bloom
+        self._built_at = time.monotonic()
+
+    def _pull(self, db: Session) -> None:
+        stmt = select(RevokedToken.jti, RevokedToken.revoked_at)
+        if self._pulled_until is not None:
+            stmt = stmt.where(RevokedToken.revoked_at >= self._pulled_until - timedelta(seconds=REVOCATION_PULL_OVERLAP_SECONDS))
+        for jti, revoked_at in db.execute(stmt).all():
+            # Rows in the overlap were added by an earlier pull; skipping them keeps count honest
+            if jti not in self._filter:
+                self._filter.add(jti)
+            if self._pulled_until is None or revoked_at > self._pulled_until:
+                self._pulled_until = revoked_at
+
+    def refresh(self) -> None:
+        """
+        Bring the filter up to date if it is older than REVOCATION_REFRESH_SECONDS.
+        """
+        if time.monotonic() - self._refreshed_at < REVOCATION_REFRESH_SECONDS:
+            return
+        with self._lock:
+            if time.monotonic() - self._refreshed_at < REVOCATION_REFRESH_SECONDS:
+                return
+            db = SessionLocal()
+            try:
+                stale = time.monotonic() - self._built_at > REVOCATION_REBUILD_SECONDS
+                if self._filter is None or stale or self._filter.count > self._filter.capacity:
+                    self._rebuild(db)
+                else:
+                    self._pull(db)
+                self._refreshed_at = time.monotonic()
+            except SQLAlchemyError as e:
+                # Keep serving from the last good filter; the next request retries
+                logger.warning("Could not refresh token revocations: %s", e)
+            finally:
+                db.close()
+
+    def is_revoked(self, jti: str) -> bool:
+        """
+        Whether a token id has been revoked.
+        """
+        self.refresh()
+        # Without a filter (never built, e.g. the database was down) every token is checked in the table
+        if self._filter is not None and jti not in self._filter:
+            return False
+        db = SessionLocal()
+        try:
+            return db.scalar(select(RevokedToken.id).where(RevokedToken.jti == jti)) is not None
+        finally:
+            db.close()
+
+    def revoke(self, db: Session, jti: str, expires_at: datetime) -> bool:
+        """
+        Persist a revocation and apply it to this worker immediately.
+        Returns False if the token was already revoked, by this or any other worker.
+        """
+        inserted = db.scalar(
+            insert(RevokedToken).values(jti=jti, expires_at=expires_at).on_conflict_do_nothing().returning(RevokedToken.jti)
+        )
+        db.commit()
+        with self._lock:
+            if self._filter is not None and jti not in self._filter:
+                self._filter.add(jti)
+        return inserted is not None
+
+
+revocation_list = RevocationList()
+
+
+@periodic_job("purge_revoked_tokens", REVOCATION_PURGE_SECONDS)
+def purge_revoked_tokens(db: Session, payload: dict) -> None:
+    """
+    Delete revocations of tokens that have expired anyway; they are rejected on their exp claim.
+    """
+    db.execute(delete(RevokedToken).where(RevokedToken.expires_at < utcnow()))
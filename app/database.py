@@ -1,39 +1,105 @@
 import os
+import threading
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 from sqlalchemy.pool import QueuePool
 from dotenv import load_dotenv
+from app.utils import query_stats  # noqa: F401  times every statement for request and per-fingerprint stats
 
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL environment variable is not set!")
-
-# Configure the engine with connection pooling and retry logic
-engine = create_engine(
-    DATABASE_URL,
-    echo=True,
-    poolclass=QueuePool,
-    pool_size=5,  # Number of connections to keep open
-    max_overflow=10,  # Maximum number of connections that can be created beyond pool_size
-    pool_timeout=30,  # Seconds to wait before giving up on getting a connection from the pool
-    pool_recycle=1800,  # Recycle connections after 30 minutes
-    pool_pre_ping=True,  # Enable connection health checks
-    connect_args={
-        "sslmode": "require",  # Force SSL
-        "connect_timeout": 10,  # Connection timeout in seconds
-        "keepalives": 1,  # Enable TCP keepalive
-        "keepalives_idle": 30,  # Seconds between keepalives
-        "keepalives_interval": 10,  # Seconds between keepalive retries
-        "keepalives_count": 5  # Number of keepalive retries
+Base = declarative_base()
+
+# Engines are created on first use so importing the app does not touch the database.
+# The schema is managed only by the Alembic migrations.
+_engine = None
+_async_engine = None
+_engine_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _database_url() -> str:
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise ValueError("DATABASE_URL environment variable is not set!")
+    return database_url
+
+
+def _pool_settings(prefix: str = "DB", pool_size: int = 5) -> dict:
+    return {
+        "pool_size": _env_int(f"{prefix}_POOL_SIZE", pool_size),  # Number of connections to keep open
+        "max_overflow": _env_int(f"{prefix}_MAX_OVERFLOW", 10),  # Connections allowed beyond pool_size
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),  # Seconds to wait for a connection from the pool
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),  # Recycle connections after 30 minutes
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") == "1",  # Enable connection health checks
     }
-)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+
+def get_engine():
+    """
+    Get the process-wide engine, creating it on first use.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(
+                    _database_url(),
+                    echo=os.getenv("DB_ECHO", "0") == "1",  # Per-statement logging, for local debugging only
+                    poolclass=QueuePool,
+                    **_pool_settings(),
+                    connect_args={
+                        "sslmode": os.getenv("DB_SSLMODE", "require"),  # Force SSL
+                        "connect_timeout": _env_int("DB_CONNECT_TIMEOUT", 10),  # Connection timeout in seconds
+                        "keepalives": 1,  # Enable TCP keepalive
+                        "keepalives_idle": 30,  # Seconds between keepalives
+                        "keepalives_interval": 10,  # Seconds between keepalive retries
+                        "keepalives_count": 5  # Number of keepalive retries
+                    }
+                )
+    return _engine
+
+
+def get_async_engine():
+    """
+    Get the process-wide asyncpg engine for the async routes, creating it on first use.
+    """
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                url = make_url(_database_url()).set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
+                _async_engine = create_async_engine(
+                    url,
+                    **_pool_settings("ASYNC_DB", pool_size=10),
+                    connect_args={
+                        "ssl": os.getenv("DB_SSLMODE", "require"),  # asyncpg takes ssl instead of sslmode
+                        "timeout": _env_int("DB_CONNECT_TIMEOUT", 10),  # Connection timeout in seconds
+                    }
+                )
+    return _async_engine
+
+
+class _LazySession(Session):
+    def __init__(self, **kwargs):
+        kwargs.setdefault("bind", get_engine())
+        super().__init__(**kwargs)
+
+
+class _LazyAsyncSession(AsyncSession):
+    def __init__(self, **kwargs):
+        kwargs.setdefault("bind", get_async_engine())
+        super().__init__(**kwargs)
+
+
+SessionLocal = sessionmaker(class_=_LazySession, autocommit=False, autoflush=False)
+
+AsyncSessionLocal = async_sessionmaker(class_=_LazyAsyncSession, autoflush=False, expire_on_commit=False)
 
 def get_db():
     """
@@ -44,3 +110,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """
+    Get an async database session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
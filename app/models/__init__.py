@@ -1 +1 @@
-from app.models.db import User,Admin,Area,House,Broker,SuccessReport,FailureReport,Invitation,AdminLocation,VIPStatus 
\ No newline at end of file
+from app.models.db import User,Admin,Area,House,Broker,SuccessReport,FailureReport,Invitation,AdminLocation,VIPStatus,AdminStats,RevokedToken,Job 
\ No newline at end of file
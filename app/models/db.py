@@ -1,20 +1,19 @@
-
-import os
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Enum, Boolean, Numeric, Text, DateTime, ARRAY
-from sqlalchemy.orm import relationship, sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, Enum, Boolean, Numeric, Text, DateTime, ARRAY, Index, Computed
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
-from dotenv import load_dotenv
-
-load_dotenv()
+from app.database import Base
 
+# Phone numbers with spaces, dashes, dots and brackets removed; must match app.services.auth.normalize_phone
+PHONE_NORMALIZED_SQL = "regexp_replace(phone_no, '[^0-9+]', '', 'g')"
 
-Base = declarative_base()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+def utcnow() -> datetime:
+    """
+    Naive UTC now, for the naive DateTime columns; an aware value would be shifted by the session TimeZone.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # User Table
 class User(Base):
@@ -26,10 +25,17 @@ class User(Base):
     password = Column(String, nullable=False)
     invitation_code = Column(String, unique=True)
     invited_by = Column(String, nullable=True)
+    phone_normalized = Column(String, Computed(PHONE_NORMALIZED_SQL, persisted=True))
 
     houses = relationship("House", back_populates="owner_user")
     visit_requests = relationship("Invitation", back_populates="user", cascade="all, delete")
 
+    __table_args__ = (
+        # Covers the login lookup so it is answered from the index alone; unique so differently
+        # formatted spellings of one number cannot become two accounts
+        Index("ix_user_phone_normalized", "phone_normalized", unique=True, postgresql_include=["user_id", "password"]),
+    )
+
 
 #Admin Table
 class Admin(Base):
@@ -43,8 +49,16 @@ class Admin(Base):
     invitation_code = Column(String(255), unique=True)
     admin_type = Column(Enum('super-admin', 'admin', name="admin_type_enum"), nullable=False)
     password = Column(String(255), nullable=False)
+    phone_normalized = Column(String, Computed(PHONE_NORMALIZED_SQL, persisted=True))
     success_reports = relationship("SuccessReport", back_populates="admin")
     failure_reports = relationship("FailureReport", back_populates="admin")
+
+    __table_args__ = (
+        Index(
+            "ix_admin_phone_normalized", "phone_normalized", unique=True,
+            postgresql_include=["admin_id", "password", "admin_type"],
+        ),
+    )
     
 
 #Area Table
@@ -56,6 +70,11 @@ class Area(Base):
 
     houses = relationship("House", back_populates="area")
 
+    __table_args__ = (
+        # Lets the admin search's ILIKE '%term%' on area names use an index
+        Index("ix_area_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
+
 # House Table
 class House(Base):
     __tablename__ = 'house'
@@ -78,30 +97,50 @@ class House(Base):
     price = Column(Numeric(10, 2), nullable=False)
     negotiability = Column(Enum('open to negotiation', 'not', name="negotiability_enum"), nullable=False)
     parking_space = Column(Boolean, nullable=False, default=False)
-    assigned_for = Column(Integer, ForeignKey('admin.admin_id'), nullable=True)
+    assigned_for = Column(Integer, ForeignKey('admin.admin_id'), nullable=True, index=True)
     owner = Column(Integer, ForeignKey('user.user_id', ondelete="SET NULL"), nullable=True)
     status = Column(Enum('pending', 'available', 'rented', 'sold', name="status_enum"), nullable=False, default='pending')
     image_urls = Column(ARRAY(Text), nullable=True)
     video = Column(String(255), nullable=True)
     posted_by = Column(Integer, ForeignKey('broker.broker_id'), nullable=True)
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('english', coalesce(description, '') || ' ' || coalesce(address, '') || ' ' "
+            "|| coalesce(location, '') || ' ' || coalesce(facility, ''))",
+            persisted=True,
+        ),
+        nullable=True,
+    )
 
     owner_user = relationship("User", back_populates="houses")
     broker = relationship("Broker", back_populates="houses")
     vip_status = relationship("VIPStatus", uselist=False, back_populates="house", cascade="all, delete")
     area = relationship("Area", back_populates="houses")
 
+    __table_args__ = (
+        # Supports the house_id seek used by cursor pagination within a category
+        Index("ix_house_category_house_id", "category", "house_id"),
+        Index("ix_house_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
 # VIP Status Table
 class VIPStatus(Base):
     __tablename__ = 'vip_status'
 
     vip_id = Column(Integer, primary_key=True, autoincrement=True)
     house_id = Column(Integer, ForeignKey('house.house_id', ondelete="CASCADE"), nullable=False, unique=True)
-    created_date = Column(DateTime, default=datetime.now(timezone.utc), nullable=False)
-    duration = Column(Integer, nullable=False)
+    created_date = Column(DateTime, default=utcnow, nullable=False)
+    duration = Column(Integer, nullable=False)  # days
     price = Column(Numeric(10, 2), nullable=False)
+    expires_at = Column(DateTime, Computed("created_date + duration * interval '1 day'", persisted=True))
 
     house = relationship("House", back_populates="vip_status")
 
+    __table_args__ = (
+        Index("ix_vip_status_expires_at", "expires_at"),
+    )
+
 # Broker Table
 class Broker(Base):
     __tablename__ = 'broker'
@@ -118,7 +157,7 @@ class Invitation(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey('user.user_id'), nullable=False)
-    house_id = Column(Integer, ForeignKey('house.house_id'), nullable=False)
+    house_id = Column(Integer, ForeignKey('house.house_id'), nullable=False, index=True)
     request_date = Column(DateTime, default=datetime.now(timezone.utc))
     visited_date = Column(DateTime, nullable=True)
 
@@ -133,7 +172,7 @@ class SuccessReport(Base):
     __tablename__ = 'success_report'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    admin_id = Column(Integer, ForeignKey('admin.admin_id', ondelete="CASCADE"), nullable=False)
+    admin_id = Column(Integer, ForeignKey('admin.admin_id', ondelete="CASCADE"), nullable=False, index=True)
     invitation_id = Column(Integer, ForeignKey('invitation.id'), nullable=False)
     price = Column(Numeric(10, 2), nullable=False)
     type = Column(Enum('rent', 'sell', name="report_type_enum"), nullable=False)
@@ -148,7 +187,7 @@ class FailureReport(Base):
     __tablename__ = 'failure_report'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    admin_id = Column(Integer, ForeignKey('admin.admin_id'), nullable=False)
+    admin_id = Column(Integer, ForeignKey('admin.admin_id'), nullable=False, index=True)
     invitation_id = Column(Integer, ForeignKey('invitation.id'), nullable=False)
     reason = Column(Text, nullable=False)
 
@@ -163,13 +202,56 @@ class AdminLocation(Base):
     admin_id = Column(Integer, ForeignKey('admin.admin_id'), nullable=False)
     area_code = Column(Integer, ForeignKey('area.code'), nullable=False, default=0)
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
-
-# Function to get a database session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Admin Stats Table
+class AdminStats(Base):
+    """
+    Per-admin dashboard counters, kept up to date by the code that writes
+    houses, visit requests and reports.
+    """
+    __tablename__ = 'admin_stats'
+
+    admin_id = Column(Integer, ForeignKey('admin.admin_id', ondelete="CASCADE"), primary_key=True)
+    total_houses = Column(Integer, nullable=False, default=0)
+    pending_visits = Column(Integer, nullable=False, default=0)
+    success_count = Column(Integer, nullable=False, default=0)
+    failure_count = Column(Integer, nullable=False, default=0)
+    pending_reports = Column(Integer, nullable=False, default=0)
+    total_revenue = Column(Numeric(14, 2), nullable=False, default=0)
+
+# Revoked Token Table
+class RevokedToken(Base):
+    """
+    Denylist of token ids (jti) revoked before their expiry.
+    """
+    __tablename__ = 'revoked_token'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    jti = Column(String(64), nullable=False, unique=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, default=utcnow, nullable=False)
+
+# Background Job Table
+class Job(Base):
+    """
+    Durable queue of background jobs, claimed by workers with FOR UPDATE SKIP LOCKED.
+    """
+    __tablename__ = 'job'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False)
+    payload = Column(JSONB, nullable=True)
+    status = Column(Enum('queued', 'running', 'done', 'failed', name="job_status_enum"), nullable=False, default='queued')
+    run_at = Column(DateTime, default=utcnow, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    last_error = Column(Text, nullable=True)
+    locked_by = Column(String(100), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Only queued jobs are polled, so the index stays small as finished jobs pile up
+        Index("ix_job_queued_run_at", "run_at", postgresql_where=(status == 'queued')),
+        Index("ix_job_name_created_at", "name", "created_at"),
+    )
@@ -1,17 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Form, File, UploadFile, Query # type: ignore
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Form, File, UploadFile, Query # type: ignore
+from fastapi.responses import StreamingResponse # type: ignore
+from starlette.concurrency import run_in_threadpool # type: ignore
 from fastapi.security import OAuth2PasswordRequestForm # type: ignore
 from sqlalchemy.orm import Session # type: ignore
+from sqlalchemy.ext.asyncio import AsyncSession # type: ignore
+from sqlalchemy import func, select # type: ignore
 from passlib.context import CryptContext # type: ignore
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models import Admin, House, User, Invitation, FailureReport, SuccessReport, Area
 from datetime import timedelta
 from app.services.admin import get_dashboard_data
+from app.services.admin.admin_stats import bump_admin_stats, house_removal_deltas, success_report_deltas
+from app.services.admin.house_import import default_owner_password_hash, import_houses
+from app.services.admin.house_export import EXPORT_FIELDS, EXPORT_FORMATS, stream_houses
+from app.services.user import house_index
+from app.services import reference_data
+from app.services.auth import forget_unknown_phone, normalize_phone
+from app.services.media_storage import store_upload, store_upload_async
+from app.services.media_derivatives import schedule_derivatives
+from app.schemas.house import HOUSE_ADMIN_LIST_FIELDS, house_response, house_serializer, parse_fields, serialize_houses
+from app.utils import slow_queries
 from app.schemas.schemas import AdminCreate, HouseUpdate, AreaCreate
-from app.auth.auth_handler import get_password_hash
-from app.auth.dependencies import get_current_user
+from app.auth.auth_handler import get_password_hash_metrics
+from app.auth.dependencies import get_current_user, get_current_principal
 from typing import List, Optional
-import os
-import shutil
 import json
 
 router = APIRouter(prefix='/admin', tags=['Admin'])
@@ -19,17 +31,17 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 @router.get("/dashboard")
-def dashboard(current_admin: Admin = Depends(get_current_user), db: Session = Depends(get_db)):
+def dashboard(current_admin: Admin = Depends(get_current_principal), db: Session = Depends(get_db)):
     """
     Get dashboard data for the current admin.
     """
     return get_dashboard_data(current_admin.admin_id, db)
 
 @router.get("/houselist")
-def get_admin_houses(
+async def get_admin_houses(
     page: int = Query(1, ge=1, description="Page number"),
-    db: Session = Depends(get_db), 
-    current_admin: Admin = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_admin: Admin = Depends(get_current_principal)
 ):
     """
     Get houses assigned to the current admin with pagination (10 houses per page).
@@ -42,28 +54,32 @@ def get_admin_houses(
     offset = (page - 1) * per_page
     
     # Get total count
-    total_houses = db.query(House).filter(House.assigned_for == current_admin.admin_id).count()
+    total_houses = await db.scalar(
+        select(func.count(House.house_id)).where(House.assigned_for == current_admin.admin_id)
+    )
     
     # Get paginated houses
-    houses = db.query(House).filter(
-        House.assigned_for == current_admin.admin_id
-    ).offset(offset).limit(per_page).all()
+    houses = (await db.scalars(
+        select(House).where(
+            House.assigned_for == current_admin.admin_id
+        ).order_by(House.house_id).offset(offset).limit(per_page)
+    )).all()
     
     # Calculate total pages
     total_pages = (total_houses + per_page - 1) // per_page
     
-    return {
-        "houses": houses,
+    return house_response({
+        "houses": serialize_houses(houses, HOUSE_ADMIN_LIST_FIELDS),
         "pagination": {
             "current_page": page,
             "total_pages": total_pages,
             "total_houses": total_houses,
             "houses_per_page": per_page
         }
-    }
+    })
 
 @router.delete("/delete/{house_id}")
-def delete_house(house_id: int, db: Session = Depends(get_db), current_admin: Admin = Depends(get_current_user)):
+def delete_house(house_id: int, db: Session = Depends(get_db), current_admin: Admin = Depends(get_current_principal)):
     """
     Delete a house by ID. Only the assigned admin can delete it.
     """
@@ -73,12 +89,15 @@ def delete_house(house_id: int, db: Session = Depends(get_db), current_admin: Ad
     if house.assigned_for != current_admin.admin_id:
         raise HTTPException(status_code=403, detail="You do not have permission to delete this house")
 
+    deltas = house_removal_deltas(db, house_id)
     db.delete(house)
+    bump_admin_stats(db, house.assigned_for, **deltas)
     db.commit()
+    house_index.house_deleted(house_id)
     return {"detail": "House deleted successfully"}
 
 @router.put("/edit/{house_id}")
-def update_house(house_id: int, updated_data: HouseUpdate, db: Session = Depends(get_db), current_admin: Admin = Depends(get_current_user)):
+def update_house(house_id: int, updated_data: HouseUpdate, db: Session = Depends(get_db), current_admin: Admin = Depends(get_current_principal)):
     """
     Update a house by ID. Only the assigned admin can update it.
     """
@@ -93,7 +112,8 @@ def update_house(house_id: int, updated_data: HouseUpdate, db: Session = Depends
 
     db.commit()
     db.refresh(house)
-    return house
+    house_index.house_saved(house)
+    return house_response(house_serializer(HOUSE_ADMIN_LIST_FIELDS)(house))
 
 @router.post("/house-post")
 async def admin_post_house(
@@ -119,7 +139,7 @@ async def admin_post_house(
     videoLink: Optional[str] = Form(None),
     photos: List[UploadFile] = File(...),
     db: Session = Depends(get_db),
-    current_user: Admin = Depends(get_current_user)
+    current_user: Admin = Depends(get_current_principal)
 ):
     """
     Post a new house. Validates input and saves images.
@@ -185,27 +205,20 @@ async def admin_post_house(
     if not area_obj:
         raise HTTPException(status_code=400, detail=f"Area '{area}' does not exist in the Area table.")
 
-    image_paths = []
-    os.makedirs("media/house_photos", exist_ok=True)
-    for photo in photos:
-        filename = f"{name.replace(' ', '_')}_{photo.filename}"
-        file_path = os.path.join("media/house_photos", filename)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(photo.file, buffer)
-        image_paths.append(file_path)
+    image_paths = [await store_upload_async(photo, "house_photos") for photo in photos]
 
-    owner_user = db.query(User).filter(User.phone_no == phoneNumber).first()
+    owner_user = db.query(User).filter(User.phone_normalized == normalize_phone(phoneNumber)).first()
     if not owner_user:
-        # Create new user with default password
-        hashed_password = get_password_hash("00000000")
+        # Create new user with the default owner password, hashed once per process
         new_user = User(
             name=name,
             phone_no=phoneNumber,
-            password=hashed_password
+            password=await default_owner_password_hash()
         )
         db.add(new_user)
         db.commit()
         db.refresh(new_user)
+        forget_unknown_phone(phoneNumber)
         owner_user = new_user
 
     house = House(
@@ -232,13 +245,66 @@ async def admin_post_house(
         video=videoLink
     )
     db.add(house)
+    bump_admin_stats(db, current_user.admin_id, total_houses=1)
     db.commit()
     db.refresh(house)
-    return {"success": True, "message": "House posted successfully", "house": house}
+    house_index.house_saved(house)
+    schedule_derivatives(house.image_urls)
+    return house_response({
+        "success": True,
+        "message": "House posted successfully",
+        "house": house_serializer(HOUSE_ADMIN_LIST_FIELDS)(house),
+    })
+
+@router.post("/house-import")
+async def admin_import_houses(
+    data: UploadFile = File(..., description="CSV or NDJSON with one house per row, using the /admin/house-post field names"),
+    photos: Optional[UploadFile] = File(None, description="ZIP archive with the photos named in each row's photos field"),
+    format: Optional[str] = Form(None, description="csv or ndjson; detected from the file name when omitted"),
+    db: Session = Depends(get_db),
+    current_admin: Admin = Depends(get_current_principal)
+):
+    """
+    Import many houses at once. Valid rows are inserted in one transaction; invalid rows are reported.
+    """
+    if not hasattr(current_admin, "admin_id"):
+        raise HTTPException(status_code=403, detail="Not authorized as admin")
+    owner_password = await default_owner_password_hash()
+    return await run_in_threadpool(import_houses, data, photos, current_admin.admin_id, db, owner_password, format)
+
+@router.get("/house-export")
+def admin_export_houses(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    min_price: float = None,
+    max_price: float = None,
+    house_type: str = None,
+    furnishing_status: str = None,
+    bedrooms: int = None,
+    bathrooms: int = None,
+    location: str = None,
+    category: str = "",
+    q: str = None,
+    fields: str = Query(None, description="Comma-separated columns to export; all columns when omitted"),
+    current_admin: Admin = Depends(get_current_principal)
+):
+    """
+    Stream every house matching the /user/house-list filters as NDJSON or CSV.
+    """
+    if not hasattr(current_admin, "admin_id"):
+        raise HTTPException(status_code=403, detail="Not authorized as admin")
+    return StreamingResponse(
+        stream_houses(
+            format, min_price=min_price, max_price=max_price, house_type=house_type,
+            furnishing_status=furnishing_status, bedrooms=bedrooms, bathrooms=bathrooms,
+            location=location, category=category, q=q, fields=parse_fields(fields, EXPORT_FIELDS),
+        ),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="houses.{format}"'},
+    )
 
 @router.get("/visit-request")
 def get_visit_requests_for_admin(
-    db: Session = Depends(get_db), current_admin: Admin = Depends(get_current_user)
+    db: Session = Depends(get_db), current_admin: Admin = Depends(get_current_principal)
 ):
     """
     Get all visit requests for the current admin.
@@ -252,7 +318,7 @@ def get_visit_requests_for_admin(
 
 @router.put("/{request_id}/mark-seen")
 def mark_visit_request_as_seen(
-    request_id: int, db: Session = Depends(get_db), current_admin: Admin = Depends(get_current_user)
+    request_id: int, db: Session = Depends(get_db), current_admin: Admin = Depends(get_current_principal)
 ):
     """
     Mark a visit request as seen.
@@ -262,7 +328,11 @@ def mark_visit_request_as_seen(
     request = db.query(Invitation).filter(Invitation.id == request_id).first()
     if not request:
         raise HTTPException(status_code=404, detail="Visit request not found")
+    was_pending = request.status == "not seen"
     request.status = "seen"
+    if was_pending:
+        assigned_for = db.query(House.assigned_for).filter(House.house_id == request.house_id).scalar()
+        bump_admin_stats(db, assigned_for, pending_visits=-1)
     db.commit()
     return {"detail": "Visit request marked as seen"}
 
@@ -274,7 +344,7 @@ def create_success_report(
     commission: float = Form(...),
     transaction_photo: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_user)
+    current_admin: Admin = Depends(get_current_principal)
 ):
     """
     Create a success report for a visit request.
@@ -285,11 +355,7 @@ def create_success_report(
     if not request:
         raise HTTPException(status_code=404, detail="Visit request not found")
 
-    filename = f"success_report_{request_id}_{transaction_photo.filename}"
-    file_path = os.path.join("media/transaction_photos", filename)
-    os.makedirs("media/transaction_photos", exist_ok=True)
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(transaction_photo.file, buffer)
+    file_path = store_upload(transaction_photo, "transaction_photos")
 
     report = SuccessReport(
         admin_id=current_admin.admin_id,
@@ -300,6 +366,7 @@ def create_success_report(
         transaction_photo=file_path
     )
     db.add(report)
+    bump_admin_stats(db, current_admin.admin_id, **success_report_deltas(report))
     db.commit()
     return {"detail": "Success report created"}
 
@@ -308,7 +375,7 @@ def create_failure_report(
     request_id: int,
     reason: str = Form(...),
     db: Session = Depends(get_db),
-    current_admin: Admin = Depends(get_current_user)
+    current_admin: Admin = Depends(get_current_principal)
 ):
     """
     Create a failure report for a visit request.
@@ -325,16 +392,42 @@ def create_failure_report(
         reason=reason
     )
     db.add(report)
+    bump_admin_stats(db, current_admin.admin_id, failure_count=1)
     db.commit()
     return {"detail": "Failure report created"}
 
+@router.get("/query-stats")
+def get_query_stats(
+    order_by: str = Query("total_ms", pattern="^(count|total_ms|mean_ms|p50_ms|p95_ms|max_ms)$"),
+    limit: int = Query(50, ge=1, le=1000),
+    reset: bool = Query(False, description="Clear the stats after reading them"),
+    current_admin: Admin = Depends(get_current_principal)
+):
+    """
+    Get per-fingerprint query stats for this worker process.
+    """
+    if not hasattr(current_admin, "admin_id"):
+        raise HTTPException(status_code=403, detail="Not authorized as admin")
+    stats = slow_queries.get_stats(order_by, limit)
+    if reset:
+        slow_queries.reset_stats()
+    return {"queries": stats}
+
+@router.get("/password-hash-stats")
+def get_password_hash_stats(current_admin: Admin = Depends(get_current_principal)):
+    """
+    Get queue depth and latency metrics for the password hashing executor.
+    """
+    if not hasattr(current_admin, "admin_id"):
+        raise HTTPException(status_code=403, detail="Not authorized as admin")
+    return get_password_hash_metrics()
+
 @router.get("/area")
-def getarea(db: Session = Depends(get_db)):
+def getarea(request: Request):
     """
-    Get all areas from the database.
+    Get all areas from the reference data cache.
     """
-    areas = db.query(Area).all()
-    return areas
+    return reference_data.json_response(request, reference_data.areas_json())
 
 @router.post("/area")
 def create_area(area: AreaCreate, db: Session = Depends(get_db)):
@@ -362,6 +455,7 @@ def create_area(area: AreaCreate, db: Session = Depends(get_db)):
         db.add(new_area)
         db.commit()
         db.refresh(new_area)
+        reference_data.invalidate_areas()
         return {"detail": "Area created successfully", "area": new_area}
     except Exception as e:
         db.rollback()
@@ -1,36 +1,90 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from app.models import User, Admin
-from app.auth.auth_handler import verify_password, create_access_token
-from app.database import get_db
-from app.schemas.schemas import Token
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.auth.auth_handler import (
+    verify_password_async,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    revoke_token,
+)
+from app.auth.dependencies import oauth2_scheme
+from app.database import get_db, get_async_db
+from app.models import Admin, User
+from app.schemas.schemas import Token, RefreshRequest
+from app.services.auth import lookup_credentials
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
+def issue_tokens(subject: str, role: str):
+    """
+    Create a new access and refresh token pair.
+    """
+    claims = {"sub": subject, "role": role}
+    return {
+        "access_token": create_access_token(data=claims),
+        "refresh_token": create_refresh_token(data=claims),
+        "token_type": "bearer",
+    }
+
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """
     Authenticate a user or admin and return a JWT token.
     """
     phone_no = form_data.username  # OAuth2PasswordRequestForm only accepts 'username', so treat 'username' as 'phone_no'
     password = form_data.password
 
-    user = db.query(User).filter(User.phone_no == phone_no).first()
-    role = "user"
+    credentials = await lookup_credentials(db, phone_no)
+    if not credentials:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    if user:
-        user_id = user.user_id
-    else:
-        user = db.query(Admin).filter(Admin.phone_no == phone_no).first()
-        print(user)
-        if not user:
-            raise HTTPException(status_code=401, detail="Invalid credentials")
-        role = user.admin_type
-        user_id = user.admin_id
-
-    if not verify_password(password, user.password):
+    if not await verify_password_async(password, credentials.password):
         raise HTTPException(status_code=401, detail="Invalid password")
 
-    access_token = create_access_token(data={"sub": str(user_id), "role": role})
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    return issue_tokens(str(credentials.id), credentials.role)
+
+@router.post("/refresh", response_model=Token)
+def refresh(body: RefreshRequest, db: Session = Depends(get_db)):
+    """
+    Exchange a refresh token for a new token pair. The old refresh token is revoked, and only
+    the request whose revocation inserts the row gets a pair, so each refresh token works once.
+    """
+    payload = decode_token(body.refresh_token, token_type="refresh")
+    # The role comes from the account as it is now, so deleted or demoted accounts stop refreshing
+    subject = str(payload.get("sub", ""))
+    if not subject.isdigit():
+        account = None
+    elif payload.get("role") == "user":
+        account = db.get(User, int(subject))
+    else:
+        account = db.get(Admin, int(subject))
+    if account is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not revoke_token(db, payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return issue_tokens(subject, "user" if isinstance(account, User) else account.admin_type)
+
+@router.post("/logout")
+def logout(
+    body: Optional[RefreshRequest] = Body(None),
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+):
+    """
+    Revoke the current access token and, if given, its refresh token.
+    """
+    revoke_token(db, decode_token(token))
+    if body is not None:
+        revoke_token(db, decode_token(body.refresh_token, token_type="refresh"))
+    return {"detail": "Logged out"}
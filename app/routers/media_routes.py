@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from app.auth.dependencies import get_current_principal
+from app.services.media_storage import MEDIA_ROOT, media_response
+from app.services.super_admin.admin_service import UPLOAD_DIR
+import os
+
+router = APIRouter(prefix="/media", tags=["Media"])
+
+# Collections under MEDIA_ROOT anyone can read; everything else there is not served
+PUBLIC_COLLECTIONS = {"house_photos", "derivatives"}
+
+
+@router.get("/transaction_photos/{path:path}")
+def get_transaction_photo(request: Request, path: str, current_admin=Depends(get_current_principal)):
+    """
+    Serve a success report's transaction photo. Admins only.
+    """
+    if not hasattr(current_admin, "admin_id"):
+        raise HTTPException(status_code=403, detail="Not authorized as admin")
+    return media_response(request, os.path.join(MEDIA_ROOT, "transaction_photos"), path, private=True)
+
+
+@router.get("/admin_ids/{path:path}")
+def get_admin_id_image(request: Request, path: str, current_admin=Depends(get_current_principal)):
+    """
+    Serve an admin's ID image. Admins only.
+    """
+    if not hasattr(current_admin, "admin_id"):
+        raise HTTPException(status_code=403, detail="Not authorized as admin")
+    return media_response(request, UPLOAD_DIR, path, private=True)
+
+
+@router.get("/{collection}/{path:path}")
+def get_media(request: Request, collection: str, path: str):
+    """
+    Serve a public media file such as a house photo or one of its derivatives.
+    """
+    if collection not in PUBLIC_COLLECTIONS:
+        raise HTTPException(status_code=404, detail="File not found")
+    return media_response(request, os.path.join(MEDIA_ROOT, collection), path)
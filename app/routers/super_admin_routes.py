@@ -1,34 +1,43 @@
 from typing import Optional
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import JSONResponse # Import JSONResponse
+from fastapi import APIRouter, File, Form, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import JSONResponse, StreamingResponse # Import JSONResponse
 from app.services.super_admin import dashboard_service, admin_service
+from app.services import reference_data
 
 router = APIRouter(prefix='/super_admin', tags=['super_admin'])
 
 
 @router.get('/location')
-def get_all_area():
+def get_all_area(request: Request):
     """
     Get all areas.
     """
-    # Assuming dashboard_service.get_all_location() directly returns a list of dictionaries
-    # or handles the (response, status) tuple internally.
-    # If it returns (response_dict, status_code), you'll need to adjust.
-    locations = admin_service.get_all_locations()
-    return JSONResponse(content=locations, status_code=status.HTTP_200_OK)
+    # Served from the reference data cache, pre-serialized with an ETag
+    return reference_data.json_response(request, reference_data.areas_json("area_code"))
 
 
 @router.get('/get_admins')
-def get_all_admins():
+def get_all_admins(
+    page: Optional[int] = Query(None, ge=1, description="Page number; omit to get every admin"),
+    page_size: int = Query(50, ge=1, le=500),
+    area_code: Optional[int] = Query(None, description="Only admins assigned to this area"),
+):
     """
     Get all admins.
     """
-    # admin_service.get_all_admins() should call the handler's get_all_admins()
-    # which now returns a list of dicts directly (as adjusted in the handler).
-    admins = admin_service.get_all_admins()
+    # admin_service.get_all_admins() returns a list of dicts built from a single grouped query.
+    admins = admin_service.get_all_admins(page, page_size, area_code)
     return JSONResponse(content=admins, status_code=status.HTTP_200_OK)
 
 
+@router.get('/get_admins/export')
+def export_all_admins(area_code: Optional[int] = Query(None, description="Only admins assigned to this area")):
+    """
+    Stream all admins as NDJSON.
+    """
+    return StreamingResponse(admin_service.stream_all_admins(area_code), media_type="application/x-ndjson")
+
+
 @router.post("/add_admin")
 async def add_admin(
     first_name: str = Form(...),
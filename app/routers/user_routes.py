@@ -11,22 +11,21 @@ from app.services.user import (
     user_service,
     posted_house,
     fetch_visit_r,
+    house_index,
 )
 from app.models import House 
 import random
 from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_async_db
 from app.schemas.schemas import UserCreate
+from app.schemas.house import HOUSE_DETAIL_FIELDS, HOUSE_LIST_FIELDS, house_response, parse_fields
 from app.models import User
-from app.auth.auth_handler import get_password_hash
-from app.auth.dependencies import get_current_user
-
-
-def to_dict(obj):
-    """Convert a SQLAlchemy model instance into a dictionary."""
-    if obj is None:
-        return None
-    return {column.key: getattr(obj, column.key) for column in obj.__table__.columns}
+from app.auth.auth_handler import get_password_hash_async
+from app.auth.dependencies import get_current_user, get_current_principal
+from app.services import reference_data
+from app.services.auth import forget_unknown_phone, normalize_phone
+from app.services.admin.admin_stats import bump_admin_stats, house_removal_deltas
 
 
 router = APIRouter(prefix="/user", tags=["User"])
@@ -53,12 +52,12 @@ async def signup(request: Request, db: Session = Depends(get_db)):
         if not all([phone_no, password, name]):
             raise HTTPException(status_code=400, detail="Missing required fields")
 
-        existing_user = db.query(User).filter(User.phone_no == phone_no).first()
+        existing_user = db.query(User).filter(User.phone_normalized == normalize_phone(phone_no)).first()
         if existing_user:
             print(f"Signup failed: Phone number already exists for {phone_no}")
             raise HTTPException(status_code=400, detail="Phone number already exists")
 
-        hashed_password = get_password_hash(password)
+        hashed_password = await get_password_hash_async(password)
         new_user = User(
             name=name,
             phone_no=phone_no,
@@ -68,6 +67,7 @@ async def signup(request: Request, db: Session = Depends(get_db)):
         db.add(new_user)
         db.commit()
         db.refresh(new_user)
+        forget_unknown_phone(phone_no)
 
         # Generate invitation code based on user_id + 4-digit random number
         random_number = random.randint(1000, 9999)
@@ -96,9 +96,9 @@ def index():
 
 
 @router.get("/house-list")
-def get_houses(
-    page: int = 1,
-    page_size: int = 10,
+async def get_houses(
+    page: int = Query(1, ge=1, le=10000),
+    page_size: int = Query(10, ge=1, le=100),
     min_price: float = None,
     max_price: float = None,
     house_type: str = None,
@@ -107,12 +107,40 @@ def get_houses(
     bathrooms: int = None,
     location: str = None,
     category: str = "",
+    cursor: str = None,
+    q: str = None,
+    fields: str = Query(None, description="Comma-separated fields to return, e.g. house_id,price,bedroom,thumbnail_urls"),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get a list of houses with optional filtering.
+    Pass cursor (empty for the first page) to page with next_cursor instead of page numbers.
+    Pass q to search description, address, location and facilities.
+    Pass fields to return, and load, only those fields.
+    """
+    return house_response(await house_service.get_house_list_async(
+        db, page, page_size, min_price, max_price, house_type, furnishing_status, bedrooms, bathrooms, location, category,
+        cursor, q, parse_fields(fields, HOUSE_LIST_FIELDS)
+    ))
+
+
+@router.get("/house-list/facets")
+def get_house_facets(
+    min_price: float = None,
+    max_price: float = None,
+    house_type: str = None,
+    furnishing_status: str = None,
+    bedrooms: int = None,
+    bathrooms: int = None,
+    location: str = None,
+    category: str = "",
+    q: str = None,
+):
     """
-    return house_service.get_house_list(
-        page, page_size, min_price, max_price, house_type, furnishing_status, bedrooms, bathrooms, location, category
+    Get filter counts for the house list, using the same filters as /house-list.
+    """
+    return house_service.get_house_facets(
+        min_price, max_price, house_type, furnishing_status, bedrooms, bathrooms, location, category, q
     )
 
 
@@ -206,12 +234,12 @@ def post_house(
 
 
 @router.get("/locations")
-def get_locations():
+async def get_locations(request: Request):
     """
     Get all available locations.
     """
     try:
-        return location.get_all_locations()
+        return reference_data.json_response(request, await reference_data.areas_json_async())
     except HTTPException as http_exception:
         raise http_exception
     except Exception as e:
@@ -219,12 +247,12 @@ def get_locations():
 
 
 @router.get("/vip-houses")
-def house_list():
+async def house_list(db: AsyncSession = Depends(get_async_db)):
     """
     Get a list of VIP houses.
     """
     try:
-        return featured_houses.get_featured_houses()
+        return house_response(await featured_houses.get_featured_houses_async(db))
     except HTTPException as http_exception:
         raise http_exception
     except Exception as e:
@@ -232,12 +260,19 @@ def house_list():
 
 
 @router.get("/house/{house_id}")
-def detaill(house_id: int):
+async def detaill(
+    house_id: int,
+    fields: str = Query(None, description="Comma-separated fields to return"),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Get detailed information about a specific house.
+    Pass fields to return, and load, only those fields.
     """
     try:
-        return house_detail.get_house_detail(house_id)
+        return house_response(
+            await house_detail.get_house_detail_async(db, house_id, parse_fields(fields, HOUSE_DETAIL_FIELDS))
+        )
     except HTTPException as http_exception:
         raise http_exception
     except Exception as e:
@@ -245,11 +280,14 @@ def detaill(house_id: int):
 
 
 @router.get("/admins/search")
-def search_admins_by_area_name(area_name: str = Query(..., description="Area name to search for")):
+def search_admins_by_area_name(
+    area_name: List[str] = Query(..., description="Area name to search for; repeat to search several"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of admins to return"),
+):
     """
     Search for admins by area name.
     """
-    return admin_contact.search_admins_by_area_name(area_name)
+    return admin_contact.search_admins_by_area_name(area_name, limit)
 
 
 @router.get("/profile")
@@ -269,11 +307,11 @@ def update_user_profile(user_data: dict = Body(...), current_user: User = Depend
 
 
 @router.get("/posted")
-def fetch_posted_houses(current_user: User = Depends(get_current_user)):
+def fetch_posted_houses(current_user: User = Depends(get_current_principal)):
     """
     Get all houses posted by the current user.
     """
-    return posted_house.fetch_posted_houses(current_user)
+    return house_response(posted_house.fetch_posted_houses(current_user))
 
 from fastapi import Path
 
@@ -292,12 +330,15 @@ def delete_house(
     if not house:
         raise HTTPException(status_code=404, detail="House not found or not owned by the current user")
 
+    deltas = house_removal_deltas(db, house_id)
     db.delete(house)
+    bump_admin_stats(db, house.assigned_for, **deltas)
     db.commit()
+    house_index.house_deleted(house_id)
     return {"status": "ok", "msg": f"House with ID {house_id} deleted successfully"}
 
 @router.get("/fetch_visit_request")
-def fetch_visit_requests(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def fetch_visit_requests(current_user: User = Depends(get_current_principal), db: Session = Depends(get_db)):
     """
     Get all visit requests for the current user.
     """
@@ -0,0 +1,94 @@
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import load_only
+
+from app.models import House
+from app.services.media_derivatives import thumbnail_urls
+
+# Fields of the house detail, VIP feed and posted-houses responses
+HOUSE_DETAIL_FIELDS = (
+    "house_id", "category", "location", "address", "size", "condition", "bedroom", "toilets", "bathroom",
+    "property_type", "furnish_status", "facility", "description", "price", "negotiability", "parking_space",
+    "listed_by", "status", "image_urls", "video",
+)
+# Fields of the house-list responses
+HOUSE_LIST_FIELDS = HOUSE_DETAIL_FIELDS + ("thumbnail_urls", "assigned_for", "owner", "posted_by")
+HOUSE_ADMIN_LIST_FIELDS = HOUSE_LIST_FIELDS + ("area_code",)
+
+# Fields computed from another attribute: name -> (source attribute, conversion)
+_DERIVED_FIELDS = {
+    "price": ("price", float),  # Numeric comes back as Decimal, which orjson does not encode
+    "thumbnail_urls": ("image_urls", thumbnail_urls),
+}
+
+
+@lru_cache(maxsize=128)
+def house_serializer(fields: Tuple[str, ...]) -> Callable[[object], dict]:
+    """
+    Build a function that turns a House (or any row with those attributes) into a dict of fields.
+    All attributes are read with one attrgetter call; the result is cached per field tuple.
+    """
+    sources = tuple(_DERIVED_FIELDS[name][0] if name in _DERIVED_FIELDS else name for name in fields)
+    conversions = tuple(
+        (index, _DERIVED_FIELDS[name][1]) for index, name in enumerate(fields) if name in _DERIVED_FIELDS
+    )
+    get = attrgetter(*sources)
+    single = len(sources) == 1
+
+    def serialize(house) -> dict:
+        values = get(house)
+        values = [values] if single else list(values)
+        for index, convert in conversions:
+            if values[index] is not None:
+                values[index] = convert(values[index])
+        return dict(zip(fields, values))
+
+    return serialize
+
+
+def parse_fields(fields: Optional[str], allowed: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Turn a comma-separated fields= parameter into the field tuple of a response, in the
+    response's own order. house_id is always included. No fields means all of allowed.
+    """
+    if not fields:
+        return allowed
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested.difference(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(allowed)}",
+        )
+    requested.add("house_id")
+    return tuple(name for name in allowed if name in requested)
+
+
+@lru_cache(maxsize=128)
+def house_load_options(fields: Tuple[str, ...]):
+    """
+    A load_only option that loads just the columns the fields are built from.
+    """
+    sources = {_DERIVED_FIELDS[name][0] if name in _DERIVED_FIELDS else name for name in fields}
+    sources.add("house_id")
+    # Table order keeps the generated SQL, and so its statement cache entry, stable
+    return load_only(*[getattr(House, column.key) for column in House.__table__.columns if column.key in sources])
+
+
+def serialize_houses(houses: Iterable, fields: Tuple[str, ...] = HOUSE_LIST_FIELDS) -> List[dict]:
+    """
+    Serialize many houses with the compiled serializer for fields.
+    """
+    serialize = house_serializer(fields)
+    return [serialize(house) for house in houses]
+
+
+def house_response(content, status_code: int = 200) -> ORJSONResponse:
+    """
+    Encode an already-serialized response body with orjson, skipping jsonable_encoder.
+    """
+    return ORJSONResponse(content, status_code=status_code)
@@ -34,6 +34,13 @@ class Token(BaseModel):
     """
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+class RefreshRequest(BaseModel):
+    """
+    Schema for exchanging or revoking a refresh token.
+    """
+    refresh_token: str
     
 class HouseUpdate(BaseModel):
     """
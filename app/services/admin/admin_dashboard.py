@@ -4,25 +4,20 @@ from app.models import House, Admin, SuccessReport, FailureReport
 from app.models import Invitation  # if you're tracking visit requests
 from fastapi import HTTPException
 from datetime import datetime, timedelta
+from app.services.admin.admin_stats import get_admin_stats
 
 def get_dashboard_data(admin_id: int, db: Session):
     """
     Get dashboard data for the current admin.
     """
-    houses = db.query(House).filter(House.assigned_for == admin_id).all()
-    visit_requests = db.query(Invitation).filter(Invitation.house_id.in_(
-        db.query(House.house_id).filter(House.assigned_for == admin_id)
-    )).all()
-    success_reports = db.query(SuccessReport).filter(SuccessReport.admin_id == admin_id).all()
-    failure_reports = db.query(FailureReport).filter(FailureReport.admin_id == admin_id).all()
+    stats = get_admin_stats(admin_id, db)
 
-    total_revenue = sum(report.price for report in success_reports)
-    pending_reports = len([report for report in success_reports if not report.transaction_photo])
-    pending_visits = len([request for request in visit_requests if request.status == "pending"])
-    total_reports = len(success_reports) + len(failure_reports)
-    success_rate = (len(success_reports) / total_reports * 100) if total_reports > 0 else 0
+    total_reports = stats["success_count"] + stats["failure_count"]
+    success_rate = (stats["success_count"] / total_reports * 100) if total_reports > 0 else 0
 
-    recent_transactions = db.query(SuccessReport, House).join(
+    recent_transactions = db.query(
+        SuccessReport.id, SuccessReport.price, SuccessReport.type, House.address
+    ).join(
         Invitation, SuccessReport.invitation_id == Invitation.id
     ).join(
         House, Invitation.house_id == House.house_id
@@ -33,20 +28,20 @@ def get_dashboard_data(admin_id: int, db: Session):
     ).limit(5).all()
 
     return {
-        "totalRevenue": f"{total_revenue:,.2f}",
-        "pendingReports": pending_reports,
-        "totalHouses": len(houses),
-        "pendingVisits": pending_visits,
+        "totalRevenue": f"{stats['total_revenue']:,.2f}",
+        "pendingReports": stats["pending_reports"],
+        "totalHouses": stats["total_houses"],
+        "pendingVisits": stats["pending_visits"],
         "successRate": f"{success_rate:.1f}",
         "recentTransactions": [
             {
                 "id": report.id,
-                "house": house.title,
+                "house": report.address,
                 "amount": f"{report.price:,.2f}",
-                "date": report.created_at.strftime("%Y-%m-%d") if hasattr(report, 'created_at') else datetime.now().strftime("%Y-%m-%d"),
+                "date": datetime.now().strftime("%Y-%m-%d"),
                 "type": report.type
             }
-            for report, house in recent_transactions
+            for report in recent_transactions
         ],
         # "houses": [
         #     {
@@ -0,0 +1,141 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from app.models import House, Invitation, SuccessReport, FailureReport, AdminStats
+from app.services.jobs import periodic_job
+from typing import Optional
+import os
+
+ADMIN_STATS_RECONCILE_SECONDS = float(os.getenv("ADMIN_STATS_RECONCILE_SECONDS", "3600"))
+
+# A success report still waiting for its transaction photo
+_PENDING_REPORT = or_(SuccessReport.transaction_photo.is_(None), SuccessReport.transaction_photo == "")
+
+
+def stats_table_enabled() -> bool:
+    """
+    The dashboard reads from admin_stats only with ADMIN_STATS_TABLE=1.
+    """
+    return os.getenv("ADMIN_STATS_TABLE", "0") == "1"
+
+
+def _admin_stats_query(admin_id: int):
+    total_houses = select(func.count(House.house_id)).where(House.assigned_for == admin_id).scalar_subquery()
+    pending_visits = select(func.count(Invitation.id)).join(
+        House, Invitation.house_id == House.house_id
+    ).where(
+        House.assigned_for == admin_id, Invitation.status == "not seen"
+    ).scalar_subquery()
+    failure_count = select(func.count(FailureReport.id)).where(FailureReport.admin_id == admin_id).scalar_subquery()
+
+    return select(
+        literal(admin_id).label("admin_id"),
+        total_houses.label("total_houses"),
+        pending_visits.label("pending_visits"),
+        failure_count.label("failure_count"),
+        func.count(SuccessReport.id).label("success_count"),
+        func.count(SuccessReport.id).filter(_PENDING_REPORT).label("pending_reports"),
+        func.coalesce(func.sum(SuccessReport.price), 0).label("total_revenue"),
+    ).select_from(SuccessReport).where(SuccessReport.admin_id == admin_id)
+
+
+def compute_admin_stats(admin_id: int, db: Session) -> dict:
+    """
+    Compute the dashboard counters for an admin with a single aggregate query.
+    """
+    values = dict(db.execute(_admin_stats_query(admin_id)).one()._mapping)
+    del values["admin_id"]
+    return values
+
+
+def _seed_admin_stats(db: Session, admin_id: int) -> bool:
+    """
+    Create an admin's stats row from a full count, unless it exists. Returns whether it was created.
+    A concurrent seed blocks on the primary key until the other transaction ends.
+    """
+    query = _admin_stats_query(admin_id)
+    return db.scalar(
+        insert(AdminStats)
+        .from_select([column.name for column in query.selected_columns], query)
+        .on_conflict_do_nothing()
+        .returning(AdminStats.admin_id)
+    ) is not None
+
+
+def get_admin_stats(admin_id: int, db: Session) -> dict:
+    """
+    Get the dashboard counters, from admin_stats when enabled, seeding the row on first read.
+    """
+    if not stats_table_enabled():
+        return compute_admin_stats(admin_id, db)
+
+    stats = db.get(AdminStats, admin_id)
+    if stats is None:
+        _seed_admin_stats(db, admin_id)
+        db.commit()
+        stats = db.get(AdminStats, admin_id)
+    return {
+        "total_houses": stats.total_houses,
+        "pending_visits": stats.pending_visits,
+        "failure_count": stats.failure_count,
+        "success_count": stats.success_count,
+        "pending_reports": stats.pending_reports,
+        "total_revenue": stats.total_revenue,
+    }
+
+
+def bump_admin_stats(db: Session, admin_id: Optional[int], **deltas) -> None:
+    """
+    Apply counter deltas to an admin's stats row in the caller's transaction. Call it after
+    the change is made in the session: an admin without a row is seeded from a full count,
+    which then already includes the change.
+    """
+    if admin_id is None or not deltas or not stats_table_enabled():
+        return
+    bump = (
+        update(AdminStats)
+        .where(AdminStats.admin_id == admin_id)
+        .values({name: getattr(AdminStats, name) + delta for name, delta in deltas.items()})
+        .returning(AdminStats.admin_id)
+    )
+    if db.scalar(bump) is not None:
+        return
+    db.flush()
+    if not _seed_admin_stats(db, admin_id):
+        # Seeded by another transaction since the update; its count does not include this change
+        db.execute(bump)
+
+
+def house_removal_deltas(db: Session, house_id: int) -> dict:
+    """
+    Deltas for deleting a house: the house itself and its visit requests that are still pending.
+    Read them before the delete.
+    """
+    if not stats_table_enabled():
+        return {}
+    pending = db.scalar(
+        select(func.count(Invitation.id)).where(Invitation.house_id == house_id, Invitation.status == "not seen")
+    )
+    return {"total_houses": -1, "pending_visits": -pending}
+
+
+def success_report_deltas(report: SuccessReport) -> dict:
+    """
+    Deltas for a new success report, counting it as pending by the same rule as the full count.
+    """
+    return {
+        "success_count": 1,
+        "total_revenue": report.price,
+        "pending_reports": 0 if report.transaction_photo else 1,
+    }
+
+
+@periodic_job("reconcile_admin_stats", ADMIN_STATS_RECONCILE_SECONDS)
+def reconcile_admin_stats(db: Session, payload: dict) -> None:
+    """
+    Recount every admin_stats row from the source tables, correcting any drift in the bumped counters.
+    """
+    if not stats_table_enabled():
+        return
+    for admin_id in db.scalars(select(AdminStats.admin_id)).all():
+        db.execute(update(AdminStats).where(AdminStats.admin_id == admin_id).values(**compute_admin_stats(admin_id, db)))
@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+from decimal import Decimal
+from typing import Iterator, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models import House
+from app.services.user.house_service import apply_house_filters
+
+# Every stored column except the generated search_vector
+EXPORT_COLUMNS = [column for column in House.__table__.columns if column.name != "search_vector"]
+EXPORT_FIELDS = tuple(column.name for column in EXPORT_COLUMNS)
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return ";".join(value)
+    return _value(value)
+
+
+def stream_houses(
+    export_format: str = "ndjson",
+    batch_size: int = 1000,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    house_type: Optional[str] = None,
+    furnishing_status: Optional[str] = None,
+    bedrooms: Optional[int] = None,
+    bathrooms: Optional[int] = None,
+    location: Optional[str] = None,
+    category: str = "",
+    q: Optional[str] = None,
+    fields: Tuple[str, ...] = EXPORT_FIELDS,
+) -> Iterator[str]:
+    """
+    Yield every house matching the house-list filters as NDJSON lines or CSV, one chunk per
+    batch. Rows are read through a server-side cursor, so memory stays at one batch.
+    Only the columns in fields are selected.
+    """
+    columns = [column for column in EXPORT_COLUMNS if column.name in fields]
+    names = [column.name for column in columns]
+    stmt = apply_house_filters(
+        select(*columns), min_price, max_price, house_type, furnishing_status, bedrooms, bathrooms,
+        location, category, q,
+    ).order_by(House.house_id)
+
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(names)
+            for rows in result.partitions():
+                writer.writerows([_csv_value(value) for value in row] for row in rows)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        else:
+            for rows in result.partitions():
+                yield "".join(
+                    json.dumps({name: _value(value) for name, value in zip(names, row)}) + "\n" for row in rows
+                )
+    finally:
+        db.close()
@@ -0,0 +1,325 @@
+import csv
+import io
+import json
+import math
+import os
+import time
+import zipfile
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.auth.auth_handler import get_password_hash_async
+from app.models import Area, House, User
+from app.services.admin.admin_stats import bump_admin_stats
+from app.services.auth import forget_unknown_phone, normalize_phone
+from app.services.media_derivatives import schedule_derivatives
+from app.services.media_storage import store_file
+from app.services.user import house_index
+
+HOUSE_IMPORT_MAX_ROWS = int(os.getenv("HOUSE_IMPORT_MAX_ROWS", "2000"))
+ALLOWED_PHOTO_EXTENSIONS = {"jpg", "jpeg", "png"}
+# Owners created by an import get the same default password as owners created by /admin/house-post
+DEFAULT_OWNER_PASSWORD = "00000000"
+
+_ENUM_FIELDS = {
+    "category": "category",
+    "condition": "condition",
+    "propertyType": "property_type",
+    "furnishStatus": "furnish_status",
+    "negotiability": "negotiability",
+    "listedBy": "listed_by",
+}
+_INT_FIELDS = {"size": "size", "bedrooms": "bedroom", "toilets": "toilets", "bathrooms": "bathroom"}
+# Free-text fields stored in length-limited columns
+_TEXT_FIELDS = {"location": "location", "address": "address", "videoLink": "video"}
+INT4_MIN, INT4_MAX = -2 ** 31, 2 ** 31 - 1
+# Largest value house.price (Numeric(10, 2)) can hold
+PRICE_MAX = Decimal("99999999.99")
+
+_default_owner_password_hash: Optional[str] = None
+
+
+def _read_rows(upload: UploadFile, data_format: Optional[str]) -> Iterator[dict]:
+    if data_format is None:
+        data_format = "csv" if (upload.filename or "").lower().endswith(".csv") else "ndjson"
+    if data_format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="Format must be 'csv' or 'ndjson'.")
+    # Undecodable bytes become U+FFFD, so a bad line is reported without losing the rows after it
+    text = io.TextIOWrapper(upload.file, encoding="utf-8-sig", errors="replace", newline="")
+    if data_format == "csv":
+        for row in csv.DictReader(text):
+            if any("\ufffd" in (value or "") for value in row.values() if isinstance(value, str)):
+                yield {"_error": "Row is not valid UTF-8."}
+            else:
+                yield row
+    else:
+        for line in text:
+            if line.strip():
+                if "\ufffd" in line:
+                    yield {"_error": "Line is not valid UTF-8."}
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield {"_error": f"Invalid JSON: {e.msg}"}
+                    continue
+                yield row if isinstance(row, dict) else {"_error": "Each line must be a JSON object."}
+
+
+def _text(row: dict, field: str) -> str:
+    value = row.get(field)
+    return "" if value is None else str(value).strip()
+
+
+def _list(value) -> List[str]:
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    value = "" if value is None else str(value).strip()
+    if value.startswith("["):
+        return [str(item).strip() for item in json.loads(value)]
+    separator = ";" if ";" in value else ","
+    return [item.strip() for item in value.split(separator) if item.strip()]
+
+
+def validate_row(row: dict) -> Tuple[dict, dict]:
+    """
+    Check one import row with the /admin/house-post rules and return (house values, errors).
+    The house values still need area_code, owner and image_urls.
+    """
+    if "_error" in row:
+        return {}, {"format": row["_error"]}
+
+    errors = {}
+    values = {"location": _text(row, "location"), "address": _text(row, "address")}
+    for field, column in _ENUM_FIELDS.items():
+        value = _text(row, field)
+        allowed = House.__table__.c[column].type.enums
+        if value not in allowed:
+            errors[field] = f"Must be one of: {', '.join(allowed)}."
+        else:
+            values[column] = value
+    for field, column in _INT_FIELDS.items():
+        try:
+            number = float(_text(row, field))
+        except (ValueError, OverflowError):
+            errors[field] = "Must be a number."
+            continue
+        if not math.isfinite(number) or not INT4_MIN <= number <= INT4_MAX:
+            errors[field] = f"Must be a number between {INT4_MIN} and {INT4_MAX}."
+        elif not number.is_integer():
+            errors[field] = "Must be a whole number."
+        else:
+            values[column] = int(number)
+    try:
+        # Rounded to cents the way the column stores it, so the range check sees the stored value
+        price = Decimal(_text(row, "price"))
+        values["price"] = price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) if price.is_finite() else price
+    except InvalidOperation:
+        errors["price"] = "Must be a number."
+
+    if not _text(row, "area"):
+        errors["area"] = "Area is required."
+    if not values["location"]:
+        errors["location"] = "Location is required."
+    if not values["address"]:
+        errors["address"] = "Address is required."
+    if "size" not in errors and values["size"] <= 0:
+        errors["size"] = "Size must be greater than 0."
+    for field in ("bedrooms", "toilets", "bathrooms"):
+        if field not in errors and values[_INT_FIELDS[field]] < 0:
+            errors[field] = f"{field.capitalize()} cannot be negative."
+    if "price" not in errors and not (values["price"].is_finite() and 0 < values["price"] <= PRICE_MAX):
+        errors["price"] = f"Price must be greater than 0 and at most {PRICE_MAX}."
+    for field, column in _TEXT_FIELDS.items():
+        limit = House.__table__.c[column].type.length
+        if field not in errors and len(_text(row, field)) > limit:
+            errors[field] = f"Must be at most {limit} characters."
+
+    description = _text(row, "description")
+    if len(description) < 20:
+        errors["description"] = "Description must be at least 20 characters."
+    values["description"] = description
+    if not _text(row, "name"):
+        errors["name"] = "Name is required."
+    if not normalize_phone(_text(row, "phoneNumber")):
+        errors["phoneNumber"] = "Phone number is required."
+
+    try:
+        values["facility"] = json.dumps(_list(row.get("facilities")))
+    except (json.JSONDecodeError, TypeError):
+        errors["facilities"] = "Invalid facilities format."
+    try:
+        photos = _list(row.get("photos"))
+        if not photos:
+            errors["photos"] = "At least one photo is required."
+        elif any(photo.rsplit(".", 1)[-1].lower() not in ALLOWED_PHOTO_EXTENSIONS for photo in photos):
+            errors["photos"] = "Only JPG, JPEG, and PNG files are allowed."
+    except (json.JSONDecodeError, TypeError):
+        errors["photos"] = "Invalid photos format."
+
+    parking = row.get("parkingSpace")
+    values["parking_space"] = parking if isinstance(parking, bool) else _text(row, "parkingSpace").lower() in ("true", "1", "yes")
+    values["video"] = _text(row, "videoLink") or None
+    return values, errors
+
+
+class _PhotoArchive:
+    """
+    Stores archive members on first use, so a photo shared by several rows is read once.
+    """
+
+    def __init__(self, upload: Optional[UploadFile]):
+        self._zip = None
+        if upload is not None:
+            try:
+                self._zip = zipfile.ZipFile(upload.file)
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail="Photos must be a ZIP archive.")
+        self._stored: Dict[str, str] = {}
+
+    def store(self, name: str) -> str:
+        if name not in self._stored:
+            if self._zip is None:
+                raise LookupError("No photo archive was uploaded.")
+            try:
+                info = self._zip.getinfo(name)
+            except KeyError:
+                raise LookupError(f"'{name}' is not in the photo archive.")
+            with self._zip.open(info) as member:
+                self._stored[name] = store_file(member, name, "house_photos", info.file_size)
+        return self._stored[name]
+
+
+async def default_owner_password_hash() -> str:
+    """
+    The password hash given to owners an import creates. Hashed once per process on the
+    bounded password executor; every new owner shares the same default password anyway.
+    """
+    global _default_owner_password_hash
+    if _default_owner_password_hash is None:
+        _default_owner_password_hash = await get_password_hash_async(DEFAULT_OWNER_PASSWORD)
+    return _default_owner_password_hash
+
+
+def _resolve_owners(db: Session, owners: Dict[str, Tuple[str, str]], password: str) -> Dict[str, int]:
+    """
+    Map normalized phone numbers to user ids, creating the users that do not exist yet with two
+    statements. owners maps each normalized number to the (phone number, name) to create it with.
+    """
+    existing = dict(db.execute(
+        select(User.phone_normalized, User.user_id).where(User.phone_normalized.in_(list(owners)))
+    ).all())
+    missing = [phone for phone in owners if phone not in existing]
+    if missing:
+        created = db.execute(
+            pg_insert(User)
+            .values([{"name": owners[phone][1], "phone_no": owners[phone][0], "password": password} for phone in missing])
+            .on_conflict_do_nothing()
+            .returning(User.phone_normalized, User.user_id)
+        ).all()
+        existing.update(dict(created))
+        for phone in missing:
+            forget_unknown_phone(phone)
+        if len(existing) < len(owners):
+            # Created concurrently by someone else between the two statements
+            existing.update(db.execute(
+                select(User.phone_normalized, User.user_id)
+                .where(User.phone_normalized.in_([p for p in owners if p not in existing]))
+            ).all())
+    return existing
+
+
+def import_houses(
+    data: UploadFile,
+    photos: Optional[UploadFile],
+    admin_id: int,
+    db: Session,
+    owner_password: str,
+    data_format: Optional[str] = None,
+) -> dict:
+    """
+    Import many houses in one transaction. Invalid rows are reported and skipped.
+    owner_password is the hash given to owners the import creates.
+    """
+    started = time.perf_counter()
+    rows = []
+    errors = []
+    total_rows = 0
+    for number, row in enumerate(_read_rows(data, data_format), start=1):
+        if number > HOUSE_IMPORT_MAX_ROWS:
+            raise HTTPException(status_code=413, detail=f"At most {HOUSE_IMPORT_MAX_ROWS} rows can be imported at once.")
+        total_rows = number
+        values, row_errors = validate_row(row)
+        if row_errors:
+            errors.append({"row": number, "errors": row_errors})
+        else:
+            rows.append((number, row, values))
+    parsed = time.perf_counter()
+
+    area_names = {_text(row, "area") for _, row, _ in rows}
+    area_codes = dict(db.execute(select(Area.name, Area.code).where(Area.name.in_(area_names))).all())
+
+    archive = _PhotoArchive(photos)
+    valid = []
+    for number, row, values in rows:
+        area = _text(row, "area")
+        if area not in area_codes:
+            errors.append({"row": number, "errors": {"area": f"Area '{area}' does not exist in the Area table."}})
+            continue
+        try:
+            values["image_urls"] = [archive.store(name) for name in _list(row.get("photos"))]
+        except (LookupError, HTTPException) as e:
+            errors.append({"row": number, "errors": {"photos": getattr(e, "detail", None) or str(e)}})
+            continue
+        values["area_code"] = area_codes[area]
+        valid.append((row, values))
+    stored = time.perf_counter()
+
+    house_ids = []
+    if valid:
+        owners = {}
+        for row, _ in valid:
+            owners.setdefault(normalize_phone(_text(row, "phoneNumber")), (_text(row, "phoneNumber"), _text(row, "name")))
+        owner_ids = _resolve_owners(db, owners, owner_password)
+
+        houses = [
+            dict(values, owner=owner_ids[normalize_phone(_text(row, "phoneNumber"))], assigned_for=admin_id, status="pending")
+            for row, values in valid
+        ]
+        # One executemany; SQLAlchemy batches it into multi-row INSERT ... RETURNING statements
+        house_ids = db.scalars(
+            insert(House).returning(House.house_id, sort_by_parameter_order=True), houses
+        ).all()
+        bump_admin_stats(db, admin_id, total_houses=len(house_ids))
+        db.commit()
+
+        for house_id, values in zip(house_ids, houses):
+            house_index.house_saved(SimpleNamespace(house_id=house_id, **values))
+            schedule_derivatives(values["image_urls"])
+    finished = time.perf_counter()
+
+    errors.sort(key=lambda error: error["row"])
+    elapsed = finished - started
+    return {
+        "success": not errors,
+        "imported": len(house_ids),
+        "failed": len(errors),
+        "house_ids": house_ids,
+        "errors": errors,
+        "throughput": {
+            "rows": total_rows,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(len(house_ids) / elapsed, 1) if elapsed else None,
+            "phases": {
+                "parse_seconds": round(parsed - started, 3),
+                "photos_seconds": round(stored - parsed, 3),
+                "insert_seconds": round(finished - stored, 3),
+            },
+        },
+    }
@@ -1,8 +1,13 @@
 from typing import List, Optional
 from fastapi import UploadFile, Form
 from sqlalchemy.orm import Session
-import os, json, shutil
+import json
 from app.models import House, User
+from app.services.user import house_index
+from app.services.admin.admin_stats import bump_admin_stats
+from app.services.auth import normalize_phone
+from app.services.media_storage import store_upload_async
+from app.services.media_derivatives import schedule_derivatives
 
 async def create_house_posting(
     category: str,
@@ -72,16 +77,9 @@ async def create_house_posting(
     if errors:
         return {"success": False, "errors": errors}
 
-    os.makedirs("media/house_photos", exist_ok=True)
-    image_paths = []
-    for photo in photos:
-        filename = f"{name.replace(' ', '_')}_{photo.filename}"
-        path = os.path.join("media/house_photos", filename)
-        with open(path, "wb") as f:
-            shutil.copyfileobj(photo.file, f)
-        image_paths.append(path)
+    image_paths = [await store_upload_async(photo, "house_photos") for photo in photos]
 
-    owner = db.query(User).filter(User.phone_no == phoneNumber).first()
+    owner = db.query(User).filter(User.phone_normalized == normalize_phone(phoneNumber)).first()
     if not owner:
         return {"success": False, "message": "User not found"}
 
@@ -110,8 +108,11 @@ async def create_house_posting(
     )
 
     db.add(house)
+    bump_admin_stats(db, admin_id, total_houses=1)
     db.commit()
     db.refresh(house)
+    house_index.house_saved(house)
+    schedule_derivatives(house.image_urls)
 
     return {
         "success": True,
@@ -1,8 +1,15 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import String, cast, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import User, Admin
 from app.utils.jwt import create_access_token
 from fastapi import HTTPException, status
 from passlib.context import CryptContext
+from collections import OrderedDict
+import os
+import re
+import threading
+import time
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -14,7 +21,7 @@ def verify_password(plain, hashed):
 
 def register_user(user_data, db: Session):
     print(user_data)
-    if db.query(User).filter(User.phone_no == user_data.phone_no).first():
+    if db.query(User).filter(User.phone_normalized == normalize_phone(user_data.phone_no)).first():
         raise HTTPException(status_code=400, detail="Phone number already registered.")
     user = User(
         name=user_data.name,
@@ -31,7 +38,7 @@ def register_admin(admin_data, db: Session, super_admin_id: int):
     super_admin = db.query(Admin).filter_by(admin_id=super_admin_id, admin_type='super-admin').first()
     if not super_admin:
         raise HTTPException(status_code=403, detail="Only super admins can register new admins.")
-    if db.query(Admin).filter(Admin.phone_no == admin_data.phone_no).first():
+    if db.query(Admin).filter(Admin.phone_normalized == normalize_phone(admin_data.phone_no)).first():
         raise HTTPException(status_code=400, detail="Phone number already registered.")
     admin = Admin(
         name=admin_data.name,
@@ -46,3 +53,84 @@ def register_admin(admin_data, db: Session, super_admin_id: int):
     db.commit()
     db.refresh(admin)
     return admin
+
+
+_PHONE_FORMATTING = re.compile(r"[^0-9+]")
+
+# Unknown phone numbers are remembered briefly so repeated attempts skip Postgres and bcrypt
+# Short, because creating an account only clears the entry in the worker that created it
+NEGATIVE_LOGIN_TTL = float(os.getenv("NEGATIVE_LOGIN_TTL", "5"))
+NEGATIVE_LOGIN_MAX_ENTRIES = int(os.getenv("NEGATIVE_LOGIN_MAX_ENTRIES", "10000"))
+
+_unknown_phones = OrderedDict()
+_unknown_phones_lock = threading.Lock()
+
+
+def normalize_phone(phone_no: str) -> str:
+    """
+    Strip spaces, dashes, dots and brackets, matching the phone_normalized columns.
+    """
+    return _PHONE_FORMATTING.sub("", phone_no or "")
+
+
+def is_known_unknown_phone(phone: str) -> bool:
+    """
+    Whether phone recently failed a credential lookup.
+    """
+    with _unknown_phones_lock:
+        expires = _unknown_phones.get(phone)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del _unknown_phones[phone]
+            return False
+        return True
+
+
+def remember_unknown_phone(phone: str) -> None:
+    with _unknown_phones_lock:
+        _unknown_phones[phone] = time.monotonic() + NEGATIVE_LOGIN_TTL
+        _unknown_phones.move_to_end(phone)
+        while len(_unknown_phones) > NEGATIVE_LOGIN_MAX_ENTRIES:
+            _unknown_phones.popitem(last=False)
+
+
+def forget_unknown_phone(phone_no: str) -> None:
+    """
+    Call when an account is created for phone_no so it can log in immediately.
+    """
+    with _unknown_phones_lock:
+        _unknown_phones.pop(normalize_phone(phone_no), None)
+
+
+async def lookup_credentials(db: AsyncSession, phone_no: str):
+    """
+    Find the login credentials for a phone number across users and admins in one query.
+    Returns a row with id, role and password, or None. Users win over admins, as before.
+    """
+    phone = normalize_phone(phone_no)
+    if not phone or is_known_unknown_phone(phone):
+        return None
+
+    users = select(
+        User.user_id.label("id"),
+        literal("user", String).label("role"),
+        User.password.label("password"),
+        literal(0).label("precedence"),
+    ).where(User.phone_normalized == phone)
+    admins = select(
+        Admin.admin_id.label("id"),
+        cast(Admin.admin_type, String).label("role"),
+        Admin.password.label("password"),
+        literal(1).label("precedence"),
+    ).where(Admin.phone_normalized == phone)
+    credentials = union_all(users, admins).subquery()
+
+    row = (await db.execute(
+        select(credentials.c.id, credentials.c.role, credentials.c.password)
+        .order_by(credentials.c.precedence, credentials.c.id)
+        .limit(1)
+    )).first()
+    if row is None:
+        remember_unknown_phone(phone)
+    return row
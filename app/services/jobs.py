@@ -0,0 +1,266 @@
+import logging
+import os
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, get_engine
+from app.models import Job
+from app.models.db import utcnow
+
+logger = logging.getLogger(__name__)
+
+JOB_RUNNER_ENABLED = os.getenv("JOB_RUNNER_ENABLED", "1") == "1"
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "1"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+# A running job whose worker has not finished it within the lease is handed to another worker
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "600"))
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "30"))
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "7"))
+# Session-level advisory lock held by the one node that schedules periodic jobs
+JOB_LEADER_LOCK_KEY = int(os.getenv("JOB_LEADER_LOCK_KEY", "7305839110"))
+
+JobHandler = Callable[[Session, dict], None]
+_handlers: Dict[str, JobHandler] = {}
+_periodic: Dict[str, float] = {}
+
+
+def job(name: str):
+    """
+    Register a function as the handler for one-shot jobs called name.
+    The handler gets a session and the job payload; the runner commits after it returns.
+    """
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[name] = handler
+        return handler
+    return register
+
+
+def periodic_job(name: str, interval_seconds: float):
+    """
+    Register a handler that the leader enqueues every interval_seconds.
+    """
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[name] = handler
+        _periodic[name] = interval_seconds
+        return handler
+    return register
+
+
+def enqueue(db: Session, name: str, payload: Optional[dict] = None, run_at: Optional[datetime] = None, max_attempts: int = 3) -> Job:
+    """
+    Add a job in the caller's transaction, so it runs only if the caller commits.
+    """
+    queued = Job(name=name, payload=payload or {}, run_at=run_at or utcnow(), max_attempts=max_attempts)
+    db.add(queued)
+    return queued
+
+
+def _claim(db: Session, worker_id: str):
+    now = utcnow()
+    next_job = (
+        select(Job.id)
+        .where(Job.status == "queued", Job.run_at <= now)
+        .order_by(Job.run_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    claimed = db.execute(
+        update(Job)
+        .where(Job.id == next_job)
+        .values(status="running", attempts=Job.attempts + 1, locked_by=worker_id, locked_at=now)
+        .returning(Job.id, Job.name, Job.payload, Job.attempts, Job.max_attempts)
+    ).first()
+    db.commit()
+    return claimed
+
+
+def _run(claimed, worker_id: str) -> None:
+    db = SessionLocal()
+    try:
+        try:
+            handler = _handlers.get(claimed.name)
+            if handler is None:
+                raise LookupError(f"No handler registered for job '{claimed.name}'")
+            handler(db, claimed.payload or {})
+            db.commit()
+            values = {"status": "done", "finished_at": utcnow(), "last_error": None}
+        except Exception:
+            db.rollback()
+            logger.exception("Job %s (%s) failed on attempt %d", claimed.id, claimed.name, claimed.attempts)
+            values = {"last_error": traceback.format_exc(limit=5)}
+            if claimed.attempts < claimed.max_attempts:
+                backoff = JOB_RETRY_BASE_SECONDS * 2 ** (claimed.attempts - 1)
+                values.update(status="queued", run_at=utcnow() + timedelta(seconds=backoff))
+            else:
+                values.update(status="failed", finished_at=utcnow())
+
+        # Skip the update if the lease expired and another worker has taken the job
+        db.execute(
+            update(Job)
+            .where(Job.id == claimed.id, Job.locked_by == worker_id)
+            .values(locked_by=None, locked_at=None, **values)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+class JobRunner:
+    """
+    Worker threads that run queued jobs, plus a scheduler thread that enqueues periodic
+    jobs while this process holds the leader advisory lock.
+    """
+
+    def __init__(self):
+        self.node_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._threads = []
+        self._leader_conn = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._leader_conn is not None
+
+    def start(self) -> None:
+        if not JOB_RUNNER_ENABLED or self._threads:
+            return
+        self._stop.clear()
+        for index in range(JOB_WORKERS):
+            self._threads.append(threading.Thread(target=self._work, args=(f"{self.node_id}:{index}",), name=f"job-worker-{index}", daemon=True))
+        self._threads.append(threading.Thread(target=self._schedule, name="job-scheduler", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _work(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            db = SessionLocal()
+            try:
+                claimed = _claim(db, worker_id)
+            except SQLAlchemyError as e:
+                logger.warning("Could not claim a job: %s", e)
+                claimed = None
+            finally:
+                db.close()
+            if claimed is not None:
+                _run(claimed, worker_id)
+            else:
+                self._stop.wait(JOB_POLL_SECONDS)
+
+    def _schedule(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self._acquire_leadership():
+                    self._enqueue_due()
+                    self._recover_expired_leases()
+            except SQLAlchemyError as e:
+                logger.warning("Job scheduling failed: %s", e)
+            self._stop.wait(JOB_POLL_SECONDS)
+        self._release_leadership()
+
+    def _acquire_leadership(self) -> bool:
+        if self._leader_conn is not None:
+            try:
+                self._leader_conn.execute(text("SELECT 1"))
+                self._leader_conn.commit()
+                return True
+            except SQLAlchemyError:
+                # The lock went with the connection; another node may already hold it
+                logger.warning("Lost the job scheduler leader connection")
+                self._leader_conn.invalidate()
+                self._leader_conn.close()
+                self._leader_conn = None
+                return False
+
+        conn = get_engine().connect()
+        try:
+            acquired = conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": JOB_LEADER_LOCK_KEY})
+            conn.commit()
+        except SQLAlchemyError:
+            conn.close()
+            raise
+        if not acquired:
+            conn.close()
+            return False
+        logger.info("%s is now the job scheduler leader", self.node_id)
+        self._leader_conn = conn
+        return True
+
+    def _release_leadership(self) -> None:
+        if self._leader_conn is None:
+            return
+        try:
+            self._leader_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": JOB_LEADER_LOCK_KEY})
+            self._leader_conn.commit()
+        except SQLAlchemyError:
+            self._leader_conn.invalidate()
+        self._leader_conn.close()
+        self._leader_conn = None
+
+    def _enqueue_due(self) -> None:
+        if not _periodic:
+            return
+        now = utcnow()
+        db = SessionLocal()
+        try:
+            # The last run is read from the table, so a new leader picks up the previous one's schedule
+            rows = db.execute(
+                select(
+                    Job.name,
+                    func.max(Job.created_at),
+                    func.count(Job.id).filter(Job.status.in_(["queued", "running"])),
+                )
+                .where(Job.name.in_(list(_periodic)))
+                .group_by(Job.name)
+            ).all()
+            last_runs = {name: (last_created, active) for name, last_created, active in rows}
+            for name, interval in _periodic.items():
+                last_created, active = last_runs.get(name, (None, 0))
+                if active:
+                    continue
+                if last_created is None or last_created + timedelta(seconds=interval) <= now:
+                    enqueue(db, name)
+            db.execute(
+                delete(Job).where(
+                    Job.status.in_(["done", "failed"]),
+                    Job.finished_at < now - timedelta(days=JOB_RETENTION_DAYS),
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _recover_expired_leases(self) -> None:
+        now = utcnow()
+        expired = (Job.status == "running", Job.locked_at < now - timedelta(seconds=JOB_LEASE_SECONDS))
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(Job)
+                .where(*expired, Job.attempts >= Job.max_attempts)
+                .values(status="failed", finished_at=now, locked_by=None, locked_at=None, last_error="Lease expired")
+            )
+            db.execute(
+                update(Job)
+                .where(*expired)
+                .values(status="queued", locked_by=None, locked_at=None, last_error="Lease expired")
+            )
+            db.commit()
+        finally:
+            db.close()
+
+
+job_runner = JobRunner()
@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import House
+from app.services.jobs import periodic_job
+from app.services.media_storage import MEDIA_PATH_PREFIX, media_file
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Derivatives are skipped and every list falls back to the originals
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Longest edge in pixels of each derivative; every size is written as JPEG and WebP
+DERIVATIVE_SIZES = {"thumb": 320, "medium": 1024}
+DERIVATIVE_FORMATS = {"jpg": "JPEG", "webp": "WEBP"}
+DERIVATIVE_QUALITY = int(os.getenv("MEDIA_DERIVATIVE_QUALITY", "80"))
+MEDIA_DERIVATIVE_WORKERS = int(os.getenv("MEDIA_DERIVATIVE_WORKERS", "2"))
+# How long an image found without derivatives is served as the original before checking the disk again
+MEDIA_DERIVATIVE_RECHECK_SECONDS = float(os.getenv("MEDIA_DERIVATIVE_RECHECK_SECONDS", "5"))
+# How long an original whose derivatives failed to generate is left alone before trying again
+MEDIA_DERIVATIVE_RETRY_SECONDS = float(os.getenv("MEDIA_DERIVATIVE_RETRY_SECONDS", "300"))
+# Most originals remembered as ready or missing; the least recently served are checked on disk again
+MEDIA_DERIVATIVE_CACHE_SIZE = int(os.getenv("MEDIA_DERIVATIVE_CACHE_SIZE", "10000"))
+MEDIA_DERIVATIVE_BACKFILL_SECONDS = float(os.getenv("MEDIA_DERIVATIVE_BACKFILL_SECONDS", "86400"))
+
+_CONTENT_NAME = re.compile(r"^[0-9a-f]{64}$")
+
+# Pillow releases the GIL while decoding and resizing, so a few threads keep this off the request path
+_executor = ThreadPoolExecutor(max_workers=MEDIA_DERIVATIVE_WORKERS, thread_name_prefix="media-derivatives")
+_lock = threading.Lock()
+_pending = set()
+# Both map an original to a monotonic time: when it was found ready, or until when it is served as the original
+_ready = OrderedDict()
+_missing = OrderedDict()
+
+
+def _remember(cache: OrderedDict, original: str, value: float) -> None:
+    # Caller holds _lock
+    cache[original] = value
+    cache.move_to_end(original)
+    while len(cache) > MEDIA_DERIVATIVE_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _is_ready(original: str) -> bool:
+    with _lock:
+        if original not in _ready:
+            return False
+        _ready.move_to_end(original)
+        return True
+
+
+def _mark_ready(original: str) -> None:
+    with _lock:
+        _remember(_ready, original, time.monotonic())
+        _missing.pop(original, None)
+
+
+def _key(original: str) -> str:
+    # Content-addressed originals already carry their hash; older uploads are keyed by path
+    name = os.path.splitext(os.path.basename(original))[0]
+    return name if _CONTENT_NAME.match(name) else hashlib.sha256(original.encode()).hexdigest()
+
+
+def derivative_path(original: str, size: str, ext: str = "webp") -> str:
+    """
+    Get the stored path of a derivative of an original image; media_file gives its disk location.
+    """
+    key = _key(original)
+    return f"{MEDIA_PATH_PREFIX}/derivatives/{key[:2]}/{key}/{size}.{ext}"
+
+
+def _generate(original: str) -> None:
+    try:
+        with Image.open(media_file(original)) as image:
+            image = ImageOps.exif_transpose(image).convert("RGB")
+            for size, edge in DERIVATIVE_SIZES.items():
+                resized = image.copy()
+                resized.thumbnail((edge, edge))
+                for ext, image_format in DERIVATIVE_FORMATS.items():
+                    path = media_file(derivative_path(original, size, ext))
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    tmp_path = f"{path}.tmp"
+                    resized.save(tmp_path, image_format, quality=DERIVATIVE_QUALITY)
+                    os.replace(tmp_path, path)
+        _mark_ready(original)
+    except Exception as e:
+        logger.warning("Could not generate derivatives for %s: %s", original, e)
+        with _lock:
+            _remember(_missing, original, time.monotonic() + MEDIA_DERIVATIVE_RETRY_SECONDS)
+    finally:
+        with _lock:
+            _pending.discard(original)
+
+
+def schedule_derivatives(image_urls: Optional[Iterable[str]]) -> None:
+    """
+    Queue derivative generation for a house's images. Returns immediately.
+    """
+    if Image is None or not image_urls:
+        return
+    for original in image_urls:
+        with _lock:
+            if original in _pending or original in _ready:
+                continue
+            _pending.add(original)
+        _executor.submit(_generate, original)
+
+
+def _has_derivatives(original: str) -> bool:
+    # The medium WebP is the last file _generate writes
+    return os.path.exists(media_file(derivative_path(original, "medium", "webp")))
+
+
+def thumbnail_urls(image_urls: Optional[List[str]], size: str = "thumb") -> Optional[List[str]]:
+    """
+    Map original images to their WebP derivatives, keeping the original for any not generated yet.
+    An original found without derivatives is queued for generation, so older uploads catch up as they are served.
+    """
+    if not image_urls:
+        return image_urls
+    urls = []
+    for original in image_urls:
+        if not _is_ready(original):
+            with _lock:
+                wait_until = _missing.get(original)
+            if wait_until is not None and time.monotonic() < wait_until:
+                urls.append(original)
+                continue
+            if not _has_derivatives(original):
+                with _lock:
+                    _remember(_missing, original, time.monotonic() + MEDIA_DERIVATIVE_RECHECK_SECONDS)
+                schedule_derivatives([original])
+                urls.append(original)
+                continue
+            # Written by another worker or an earlier process
+            _mark_ready(original)
+        urls.append(derivative_path(original, size))
+    return urls
+
+
+@periodic_job("backfill_media_derivatives", MEDIA_DERIVATIVE_BACKFILL_SECONDS)
+def backfill_media_derivatives(db: Session, payload: dict) -> None:
+    """
+    Generate derivatives for every house image that has none yet, on the job worker rather than the request pool.
+    """
+    if Image is None:
+        return
+    for image_urls in db.scalars(select(House.image_urls).where(House.image_urls.isnot(None))).yield_per(500):
+        for original in image_urls:
+            if _has_derivatives(original) or not os.path.exists(media_file(original)):
+                continue
+            with _lock:
+                if original in _pending:
+                    continue
+                _pending.add(original)
+            _generate(original)
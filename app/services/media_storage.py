@@ -0,0 +1,146 @@
+import hashlib
+import os
+import re
+import tempfile
+from typing import Optional
+
+from fastapi import HTTPException, Request, UploadFile
+from fastapi.responses import FileResponse, Response
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.etag import etag_matches
+
+# Uploads are stored as MEDIA_ROOT/<collection>/<hh>/<sha256><ext>, so identical files share one copy
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", "media")
+MEDIA_MAX_UPLOAD_BYTES = int(os.getenv("MEDIA_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+CHUNK_SIZE = 1024 * 1024
+# When set, files under MEDIA_ROOT are handed to the reverse proxy (nginx X-Accel-Redirect) under this
+# internal prefix, which the proxy maps to MEDIA_ROOT
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX")
+
+# Stored paths (image_urls, transaction photos) name files as media/<collection>/..., matching the
+# public /media URLs, whatever MEDIA_ROOT is on disk
+MEDIA_PATH_PREFIX = "media"
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+_CONTENT_HASH = re.compile(r"(?:^|/)([0-9a-f]{64})(?:/|\.|$)")
+
+# Spellings of the same format map to one extension so they dedup together
+_EXTENSION_ALIASES = {".jpeg": ".jpg"}
+
+
+def _extension(filename: str) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    return _EXTENSION_ALIASES.get(ext, ext)
+
+
+def media_file(stored_path: str) -> str:
+    """
+    Get the disk location of a stored media path.
+    """
+    prefix = f"{MEDIA_PATH_PREFIX}/"
+    if stored_path.startswith(prefix):
+        return os.path.join(MEDIA_ROOT, *stored_path[len(prefix):].split("/"))
+    return stored_path
+
+
+def content_path(collection: str, digest: str, ext: str) -> str:
+    """
+    Get the stored path of a file with the given content hash.
+    """
+    return f"{MEDIA_PATH_PREFIX}/{collection}/{digest[:2]}/{digest}{ext}"
+
+
+def store_upload(upload: UploadFile, collection: str) -> str:
+    """
+    Stream an upload to disk in chunks, hashing it on the way, and return its content-addressed
+    stored path, which does not depend on MEDIA_ROOT.
+    Raises 413 when the upload is larger than MEDIA_MAX_UPLOAD_BYTES.
+    """
+    return store_file(upload.file, upload.filename, collection, upload.size)
+
+
+def store_file(fileobj, filename: str, collection: str, size: Optional[int] = None) -> str:
+    """
+    Store any readable file object the way store_upload does, e.g. a member of an uploaded archive.
+    """
+    if size is not None and size > MEDIA_MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"'{filename}' is larger than {MEDIA_MAX_UPLOAD_BYTES} bytes.")
+
+    # The temporary file lives under MEDIA_ROOT so the final rename stays on one filesystem
+    tmp_dir = os.path.join(MEDIA_ROOT, ".tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        digest = hashlib.sha256()
+        written = 0
+        with os.fdopen(fd, "wb") as out:
+            while chunk := fileobj.read(CHUNK_SIZE):
+                written += len(chunk)
+                if written > MEDIA_MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail=f"'{filename}' is larger than {MEDIA_MAX_UPLOAD_BYTES} bytes.")
+                digest.update(chunk)
+                out.write(chunk)
+
+        stored_path = content_path(collection, digest.hexdigest(), _extension(filename))
+        path = media_file(stored_path)
+        if os.path.exists(path):
+            # Same content already stored, keep the existing copy
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        return stored_path
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+async def store_upload_async(upload: UploadFile, collection: str) -> str:
+    """
+    Store an upload from an async route without blocking the event loop.
+    """
+    return await run_in_threadpool(store_upload, upload, collection)
+
+
+def _resolve(root: str, relative_path: str) -> str:
+    base = os.path.realpath(root)
+    path = os.path.realpath(os.path.join(base, relative_path))
+    if not path.startswith(base + os.sep) or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="File not found")
+    return path
+
+
+def media_response(request: Request, root: str, relative_path: str, private: bool = False) -> Response:
+    """
+    Serve a stored file. Content-addressed files get a strong ETag from their hash and are
+    cached as immutable; Range requests are answered with partial content.
+    """
+    path = _resolve(root, relative_path)
+    match = _CONTENT_HASH.search(relative_path)
+    headers = {}
+    if match:
+        # A derivative shares its original's hash, so the file name is part of the tag
+        name = os.path.basename(relative_path)
+        headers["ETag"] = f'"{match.group(1)}"' if name.startswith(match.group(1)) else f'"{match.group(1)}-{name}"'
+        headers["Cache-Control"] = "private, max-age=31536000, immutable" if private else IMMUTABLE_CACHE_CONTROL
+    else:
+        # Files from before content addressing can be overwritten, so they are always revalidated
+        stat = os.stat(path)
+        headers["ETag"] = f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        headers["Cache-Control"] = "private, no-cache" if private else "no-cache"
+
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    if MEDIA_ACCEL_REDIRECT_PREFIX:
+        # The proxy sends the file with sendfile and handles Range itself. The prefix maps to
+        # MEDIA_ROOT, so files outside it (e.g. admin ID images) are served directly below.
+        location = os.path.relpath(path, os.path.realpath(MEDIA_ROOT))
+        if location != os.pardir and not location.startswith(os.pardir + os.sep):
+            headers["X-Accel-Redirect"] = f"{MEDIA_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{location}"
+            return Response(headers=headers)
+
+    # FileResponse answers Range requests and uses the server's zero-copy pathsend extension when offered
+    return FileResponse(path, headers=headers)
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal, SessionLocal
+from app.models import Area
+from app.utils.etag import etag_matches
+
+# Areas change rarely; writes in this process invalidate immediately and the TTL
+# bounds how long other workers can serve a stale list.
+REFERENCE_DATA_TTL = float(os.getenv("REFERENCE_DATA_TTL", "300"))
+
+
+class CachedJSON(NamedTuple):
+    body: bytes
+    etag: str
+
+
+_lock = threading.Lock()
+_areas: Optional[List[dict]] = None
+_loaded_at = 0.0
+_serialized: Dict[str, CachedJSON] = {}
+
+
+_AREAS_STATEMENT = select(Area.code, Area.name).order_by(Area.code)
+
+
+def _load_areas() -> List[dict]:
+    db = SessionLocal()
+    try:
+        return [{"code": code, "name": name} for code, name in db.execute(_AREAS_STATEMENT)]
+    finally:
+        db.close()
+
+
+def _is_fresh() -> bool:
+    return _areas is not None and time.monotonic() - _loaded_at < REFERENCE_DATA_TTL
+
+
+def _store_areas(areas: List[dict]) -> None:
+    global _areas, _loaded_at
+    _areas = areas
+    _loaded_at = time.monotonic()
+    _serialized.clear()
+
+
+def get_areas() -> List[dict]:
+    """
+    Get all areas as {"code", "name"} dicts, from the cache when it is fresh.
+    """
+    areas = _areas
+    if _is_fresh():
+        return areas
+    with _lock:
+        if not _is_fresh():
+            _store_areas(_load_areas())
+        return _areas
+
+
+def areas_json(code_key: str = "code") -> CachedJSON:
+    """
+    Get the area list serialized as JSON, with the area code under code_key.
+    """
+    areas = get_areas()
+    cached = _serialized.get(code_key)
+    if cached is None:
+        body = json.dumps(
+            [{code_key: area["code"], "name": area["name"]} for area in areas], separators=(",", ":")
+        ).encode()
+        cached = CachedJSON(body, '"' + hashlib.sha1(body).hexdigest() + '"')
+        with _lock:
+            if _areas is areas:
+                _serialized[code_key] = cached
+    return cached
+
+
+async def areas_json_async(code_key: str = "code") -> CachedJSON:
+    """
+    Async version of areas_json that reloads through the async engine on a miss.
+    """
+    if not _is_fresh():
+        async with AsyncSessionLocal() as db:
+            areas = [{"code": code, "name": name} for code, name in await db.execute(_AREAS_STATEMENT)]
+        with _lock:
+            _store_areas(areas)
+    return areas_json(code_key)
+
+
+def json_response(request: Request, cached: CachedJSON) -> Response:
+    """
+    Return cached JSON, or 304 when the client already has this version.
+    """
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+def invalidate_areas() -> None:
+    """
+    Drop the cached areas after a write.
+    """
+    global _areas
+    with _lock:
+        _areas = None
+        _serialized.clear()
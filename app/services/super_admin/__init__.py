@@ -1,2 +1,2 @@
 from .dashboard_service import get_dashboard_data
-from .admin_service import get_all_admins, add_admin, delete_admin ,add_location
\ No newline at end of file
+from .admin_service import get_all_admins, stream_all_admins, add_admin, delete_admin
\ No newline at end of file
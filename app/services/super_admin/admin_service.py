@@ -1,5 +1,10 @@
 from app.models import Admin, AdminLocation, Area
 from app.database import SessionLocal
+from sqlalchemy import func
+from typing import Optional
+import json
+from app.services import reference_data
+from app.services.auth import forget_unknown_phone, normalize_phone
 from sqlalchemy.exc import IntegrityError
 from fastapi import APIRouter, UploadFile, File, Form
 from fastapi.responses import JSONResponse
@@ -44,7 +49,7 @@ def add_admin(
         area_code_list = [code.strip() for code in area_codes.split(",") if code.strip().isdigit()]
 
         # Check duplicate phone number
-        if db.query(Admin).filter(Admin.phone_no == phone_no).first():
+        if db.query(Admin).filter(Admin.phone_normalized == normalize_phone(phone_no)).first():
             return JSONResponse(status_code=409, content={"error": "Admin with this phone number already exists."})
 
         # Hash the password before storing
@@ -62,6 +67,7 @@ def add_admin(
         db.add(new_admin)
         db.commit()
         db.refresh(new_admin)
+        forget_unknown_phone(phone_no)
 
         # Add AdminLocation entries
         for area_code in area_code_list:
@@ -80,28 +86,62 @@ def add_admin(
     finally:
         db.close()
 
-def get_all_admins():
+def _admin_directory_query(db, area_code: Optional[int] = None):
+    """
+    One row per admin with the names of all their areas, optionally limited to admins of one area.
+    """
+    query = (
+        db.query(
+            Admin.admin_id,
+            Admin.name,
+            Admin.phone_no,
+            # Admins without locations aggregate a single NULL, which is removed
+            func.array_remove(func.array_agg(Area.name), None).label("area_names"),
+        )
+        .outerjoin(AdminLocation, AdminLocation.admin_id == Admin.admin_id)
+        .outerjoin(Area, Area.code == AdminLocation.area_code)
+        .group_by(Admin.admin_id)
+        .order_by(Admin.admin_id)
+    )
+    if area_code is not None:
+        query = query.filter(
+            Admin.admin_id.in_(db.query(AdminLocation.admin_id).filter(AdminLocation.area_code == area_code))
+        )
+    return query
+
+
+def _admin_as_dict(row):
+    return {
+        "admin_id": row.admin_id,
+        "name": row.name,
+        "phone_no": row.phone_no, # Ensure 'phone_no' is returned as per frontend expectation
+        "area_codes": row.area_names, # Send the list of area names
+    }
+
+
+def get_all_admins(page: Optional[int] = None, page_size: int = 50, area_code: Optional[int] = None):
+    """
+    Get admins with their area names in one query. Without a page every admin is returned.
+    """
+    db = SessionLocal()
+    try:
+        query = _admin_directory_query(db, area_code)
+        if page is not None:
+            query = query.offset((page - 1) * page_size).limit(page_size)
+        return [_admin_as_dict(row) for row in query.all()]
+    finally:
+        db.close()
+
+
+def stream_all_admins(area_code: Optional[int] = None, batch_size: int = 1000):
+    """
+    Yield every admin as a line of NDJSON, reading rows through a server-side cursor.
+    """
     db = SessionLocal()
     try:
-        admins_data = []
-        admins = db.query(Admin).all() # Fetch all Admin objects
-        for admin in admins:
-            # For each admin, query their associated locations via AdminLocation table
-            # and then get the names from the Area table.
-            admin_locations = db.query(AdminLocation).filter(AdminLocation.admin_id == admin.admin_id).all()
-            area_names = []
-            for al in admin_locations:
-                area = db.query(Area).filter(Area.code == al.area_code).first()
-                if area:
-                    area_names.append(area.name) # Collect the name of the area
-
-            admins_data.append({
-                "admin_id": admin.admin_id,
-                "name": admin.name,
-                "phone_no": admin.phone_no, # Ensure 'phone_no' is returned as per frontend expectation
-                "area_codes": area_names, # Send the list of area names
-            })
-        return admins_data
+        query = _admin_directory_query(db, area_code).execution_options(stream_results=True)
+        for row in query.yield_per(batch_size):
+            yield json.dumps(_admin_as_dict(row)) + "\n"
     finally:
         db.close()
 
@@ -127,10 +167,4 @@ def delete_admin(admin_id):
 
 # Handler for fetching all locations (areas)
 def get_all_locations():
-    db = SessionLocal()
-    try:
-        locations = db.query(Area).all()
-        # Convert Area objects to dictionary for JSON serialization
-        return [{"area_code": loc.code, "name": loc.name} for loc in locations]
-    finally:
-        db.close()
+    return [{"area_code": area["code"], "name": area["name"]} for area in reference_data.get_areas()]
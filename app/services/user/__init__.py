@@ -1,7 +1,7 @@
-from .featured_houses import get_featured_houses
+from .featured_houses import get_featured_houses_async
 from .house_detail import get_house_detail
 from .visit_request import save_visit_request
-from .house_service import get_house_detail, get_house_list
+from .house_service import get_house_detail, get_house_list_async, get_house_facets
 from .admin_contact import search_admins_by_area_name
 from .house_post import create_house
 from .location import get_all_locations
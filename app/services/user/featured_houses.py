@@ -1,60 +1,95 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import House, VIPStatus
+from app.schemas.house import HOUSE_DETAIL_FIELDS, house_serializer
 from fastapi import HTTPException
-from app.database import SessionLocal
 from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime, timezone
+import os
+import threading
+import time
 
-def get_featured_houses():
+# Upper bound on how long the feed is cached when no promotion expires sooner
+VIP_FEED_MAX_AGE = float(os.getenv("VIP_FEED_MAX_AGE", "300"))
+FEATURED_HOUSE_FIELDS = HOUSE_DETAIL_FIELDS + ("thumbnail_urls",)
+
+_lock = threading.Lock()
+_feed = None
+_feed_valid_until = 0.0
+
+
+def invalidate_featured_houses():
     """
-    Get a list of VIP houses.
+    Drop the cached VIP feed. Call after a VIP status is created or changed.
     """
-    db = SessionLocal()
+    global _feed
+    with _lock:
+        _feed = None
+
+
+def _store_feed(feed, next_expiry, now):
+    global _feed, _feed_valid_until
+    max_age = VIP_FEED_MAX_AGE
+    if next_expiry is not None:
+        max_age = min(max_age, (next_expiry - now).total_seconds())
+    _feed = feed
+    _feed_valid_until = time.monotonic() + max_age
+
+
+async def get_featured_houses_async(db: AsyncSession):
+    """
+    Get a list of VIP houses, cached until the earliest promotion expires.
+    """
+    feed = _feed
+    if feed is not None and time.monotonic() < _feed_valid_until:
+        return feed
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
     try:
-        # Query houses that have VIP status
-        houses = db.query(House).join(VIPStatus).all()
-        
-        if not houses:
-            return []  # Return empty list if no VIP houses found
-            
-        return [
-            {
-                "house_id": house.house_id,
-                "category": house.category,
-                "location": house.location,
-                "address": house.address,
-                "size": house.size,
-                "condition": house.condition,
-                "bedroom": house.bedroom,
-                "toilets": house.toilets,
-                "bathroom": house.bathroom,
-                "property_type": house.property_type,
-                "furnish_status": house.furnish_status,
-                "facility": house.facility,
-                "description": house.description,
-                "price": float(house.price),  # Convert Decimal to float
-                "negotiability": house.negotiability,
-                "parking_space": house.parking_space,
-                "listed_by": house.listed_by,
-                "status": house.status,
-                "image_urls": house.image_urls,
-                "video": house.video,
-                "vip_status": {
-                    "duration": house.vip_status.duration,
-                    "price": float(house.vip_status.price)  # Convert Decimal to float
-                }
-            }
-            for house in houses
-        ]
+        houses = (await db.execute(_featured_houses_statement(now))).scalars().all()
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Database error occurred while fetching featured houses: {str(e)}"
         )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"An unexpected error occurred while fetching featured houses: {str(e)}"
+    feed, next_expiry = _featured_houses_result(houses)
+    with _lock:
+        _store_feed(feed, next_expiry, now)
+    return feed
+
+
+def _featured_houses_statement(now):
+    """
+    Houses with an unexpired VIP status. The join also populates house.vip_status,
+    so there is no per-row lazy load.
+    """
+    return (
+        select(House)
+        .join(House.vip_status)
+        .options(contains_eager(House.vip_status))
+        .where(VIPStatus.expires_at > now)
+        .order_by(House.house_id)
+    )
+
+
+def _featured_houses_result(houses):
+    """
+    The feed for the loaded houses and the earliest expiry among them.
+    """
+    if not houses:
+        return [], None  # Return empty list if no VIP houses found
+
+    serialize = house_serializer(FEATURED_HOUSE_FIELDS)
+    return [
+        dict(
+            serialize(house),
+            vip_status={
+                "duration": house.vip_status.duration,
+                "price": float(house.vip_status.price)  # Convert Decimal to float
+            },
         )
-    finally:
-        db.close()
+        for house in houses
+    ], min(house.vip_status.expires_at for house in houses)
+
@@ -1,8 +1,16 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from app.database import SessionLocal
 from app.models import House
 from fastapi import HTTPException
+from app.schemas.house import HOUSE_DETAIL_FIELDS, house_load_options, house_serializer
+from typing import Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+house_detail_as_dict = house_serializer(HOUSE_DETAIL_FIELDS)
 
 def get_house_detail(house_id: int):
     """
@@ -17,28 +25,7 @@ def get_house_detail(house_id: int):
         
         if house:
             print(f"House found: {house}")  # Debugging info
-            response = {
-                "house_id": house.house_id,
-                "category": house.category,
-                "location": house.location,
-                "address": house.address,
-                "size": house.size,
-                "toilets": house.toilets,
-                "condition": house.condition,
-                "bedroom": house.bedroom,
-                "facility": house.facility,
-                "property_type": house.property_type,
-                "furnish_status": house.furnish_status,
-                "negotiability": house.negotiability,
-                "bathroom": house.bathroom,
-                "price": float(house.price),
-                "status": house.status,
-                "image_urls": house.image_urls,
-                "description": house.description,
-                "parking_space": house.parking_space,
-                "listed_by": house.listed_by,
-                "video": house.video
-            }
+            response = house_detail_as_dict(house)
             return (response), 200
 
         print("House not found")  # Debugging info
@@ -56,3 +43,19 @@ def get_house_detail(house_id: int):
     finally:
         db.close()
         print("Database session closed")  # Debugging info
+
+
+async def get_house_detail_async(db: AsyncSession, house_id: int, fields: Tuple[str, ...] = HOUSE_DETAIL_FIELDS):
+    """
+    Async version of get_house_detail on an AsyncSession, loading only the columns fields need.
+    """
+    try:
+        house = await db.get(House, house_id, options=[house_load_options(fields)])
+    except SQLAlchemyError:
+        logger.exception("Could not load house %s", house_id)
+        await db.rollback()
+        return ({"error": "Database error"}), 500
+
+    if house:
+        return (house_serializer(fields)(house)), 200
+    raise HTTPException(status_code=404, detail="House not found")
@@ -0,0 +1,207 @@
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.database import SessionLocal
+from app.models import House
+
+# Columns held as one bitmap per value. Bit n of a bitmap is set when house_id n has that value.
+# Only low-cardinality columns: every distinct value costs a bitmap of max house_id bits, so free
+# text such as location is left to SQL.
+INDEXED_COLUMNS = ("category", "property_type", "furnish_status", "bedroom", "bathroom", "status")
+
+# Bytes popcounted at once when skipping to the start of a page
+_CHUNK_BYTES = 4096
+
+_BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+def enabled() -> bool:
+    """
+    The index is opt-in with HOUSE_FILTER_INDEX=1.
+    """
+    return os.getenv("HOUSE_FILTER_INDEX", "0") == "1"
+
+
+def _bitmap_from_ids(ids) -> int:
+    """
+    Build a bitmap from house ids without creating an intermediate int per id.
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+    buffer = bytearray(max(ids) // 8 + 1)
+    for house_id in ids:
+        buffer[house_id >> 3] |= 1 << (house_id & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _iter_ids(bitmap: int, skip: int = 0) -> Iterator[int]:
+    """
+    Yield the set bits of a bitmap in ascending order, skipping the first `skip` of them.
+    """
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    start = 0
+    while skip and start < len(data):
+        chunk = data[start:start + _CHUNK_BYTES]
+        count = int.from_bytes(chunk, "little").bit_count()
+        if count > skip:
+            break
+        skip -= count
+        start += _CHUNK_BYTES
+    for position in range(start, len(data)):
+        byte = data[position]
+        if not byte:
+            continue
+        for bit in _BYTE_BITS[byte]:
+            if skip:
+                skip -= 1
+                continue
+            yield position * 8 + bit
+
+
+class HouseFilterIndex:
+    """
+    In-memory bitmap index over the house-list filter columns plus a sorted price array.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bitmaps: Dict[Tuple[str, object], int] = {}
+        self._all = 0
+        self._prices: List[Tuple[float, int]] = []
+        self._rows: Dict[int, Tuple] = {}
+        self.built_at: Optional[float] = None
+
+    def build(self, houses) -> None:
+        """
+        Replace the index contents with the given (house_id, price, *INDEXED_COLUMNS) rows.
+        """
+        ids_by_value: Dict[Tuple[str, object], List[int]] = {}
+        rows = {}
+        for house_id, price, *values in houses:
+            rows[house_id] = (float(price), *values)
+            for column, value in zip(INDEXED_COLUMNS, values):
+                ids_by_value.setdefault((column, value), []).append(house_id)
+
+        bitmaps = {key: _bitmap_from_ids(ids) for key, ids in ids_by_value.items()}
+        prices = sorted((row[0], house_id) for house_id, row in rows.items())
+        with self._lock:
+            self._bitmaps = bitmaps
+            self._all = _bitmap_from_ids(rows)
+            self._prices = prices
+            self._rows = rows
+            self.built_at = time.monotonic()
+
+    def add(self, house) -> None:
+        """
+        Add or replace a single house.
+        """
+        with self._lock:
+            self._discard(house.house_id)
+            price = float(house.price)
+            values = tuple(getattr(house, column) for column in INDEXED_COLUMNS)
+            bit = 1 << house.house_id
+            for column, value in zip(INDEXED_COLUMNS, values):
+                self._bitmaps[(column, value)] = self._bitmaps.get((column, value), 0) | bit
+            self._all |= bit
+            self._prices.insert(bisect_left(self._prices, (price, house.house_id)), (price, house.house_id))
+            self._rows[house.house_id] = (price, *values)
+
+    def remove(self, house_id: int) -> None:
+        """
+        Remove a single house.
+        """
+        with self._lock:
+            self._discard(house_id)
+
+    def _discard(self, house_id: int) -> None:
+        row = self._rows.pop(house_id, None)
+        if row is None:
+            return
+        price, *values = row
+        mask = ~(1 << house_id)
+        for column, value in zip(INDEXED_COLUMNS, values):
+            self._bitmaps[(column, value)] &= mask
+        self._all &= mask
+        position = bisect_left(self._prices, (price, house_id))
+        if position < len(self._prices) and self._prices[position] == (price, house_id):
+            del self._prices[position]
+
+    def match(
+        self,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        **equals,
+    ) -> int:
+        """
+        Bitmap of houses matching the equality filters and price range. None values are ignored.
+        """
+        with self._lock:
+            result = self._all
+            for column, value in equals.items():
+                if value is None:
+                    continue
+                result &= self._bitmaps.get((column, value), 0)
+                if not result:
+                    return 0
+            if min_price is not None or max_price is not None:
+                low = 0 if min_price is None else bisect_left(self._prices, (float(min_price), -1))
+                high = len(self._prices) if max_price is None else bisect_right(
+                    self._prices, (float(max_price), float("inf"))
+                )
+                result &= _bitmap_from_ids(house_id for _, house_id in self._prices[low:high])
+            return result
+
+    def page(self, bitmap: int, offset: int, limit: int, after_id: Optional[int] = None) -> List[int]:
+        """
+        House ids of one page of a match, in house_id order. A negative after_id starts from the beginning.
+        """
+        if after_id is not None and after_id >= 0:
+            bitmap &= ~((1 << (after_id + 1)) - 1)
+        ids = []
+        for house_id in _iter_ids(bitmap, offset):
+            ids.append(house_id)
+            if len(ids) == limit:
+                break
+        return ids
+
+
+_index = HouseFilterIndex()
+_build_lock = threading.Lock()
+
+
+def get_index() -> HouseFilterIndex:
+    """
+    Get the process-wide index, building it from the database on first use and
+    rebuilding it every HOUSE_FILTER_INDEX_TTL seconds to pick up writes made by other workers.
+    """
+    ttl = float(os.getenv("HOUSE_FILTER_INDEX_TTL", "300"))
+    if _index.built_at is None or time.monotonic() - _index.built_at > ttl:
+        with _build_lock:
+            if _index.built_at is None or time.monotonic() - _index.built_at > ttl:
+                db = SessionLocal()
+                try:
+                    columns = [getattr(House, column) for column in INDEXED_COLUMNS]
+                    _index.build(db.query(House.house_id, House.price, *columns).yield_per(10000))
+                finally:
+                    db.close()
+    return _index
+
+
+def house_saved(house) -> None:
+    """
+    Keep the index in step with a house that was created or edited.
+    """
+    if enabled() and _index.built_at is not None:
+        _index.add(house)
+
+
+def house_deleted(house_id: int) -> None:
+    """
+    Keep the index in step with a deleted house.
+    """
+    if enabled() and _index.built_at is not None:
+        _index.remove(house_id)
@@ -1,10 +1,11 @@
 from typing import List, Optional
 from fastapi import HTTPException, UploadFile
 from sqlalchemy.orm import Session
-import os
 import json
-import shutil
 from app.models import House, Area, User
+from app.services.user import house_index
+from app.services.media_storage import store_upload
+from app.services.media_derivatives import schedule_derivatives
 
 ALLOWED_EXTENSIONS = {"jpg", "jpeg", "png"}
 
@@ -61,20 +62,13 @@ def create_house(
             raise HTTPException(status_code=400, detail={"facilities": "Facilities must be a valid JSON array."})
 
         # Validate and save photos
-        image_paths = []
-        try:
-            os.makedirs("media/house_photos", exist_ok=True)
-        except OSError as e:
-            raise HTTPException(status_code=500, detail=f"Failed to create directory for photos: {str(e)}")
-
         for photo in photos:
             if not photo.filename.split(".")[-1].lower() in ALLOWED_EXTENSIONS:
                 raise HTTPException(status_code=400, detail="Only JPG, JPEG, and PNG files are allowed.")
-            filename = f"{name.replace(' ', '_')}_{photo.filename}"
-            file_path = os.path.join("media/house_photos", filename)
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(photo.file, buffer)
-            image_paths.append(file_path)
+        try:
+            image_paths = [store_upload(photo, "house_photos") for photo in photos]
+        except OSError as e:
+            raise HTTPException(status_code=500, detail=f"Failed to save photos: {str(e)}")
 
         # Save house entry
         house = House(
@@ -104,6 +98,8 @@ def create_house(
         db.add(house)
         db.commit()
         db.refresh(house)
+        house_index.house_saved(house)
+        schedule_derivatives(house.image_urls)
 
         return {
             "success": True,
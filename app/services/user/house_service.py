@@ -1,38 +1,168 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from app.database import SessionLocal
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, case, func, literal_column, select, tuple_
 from app.models import House
+from app.services.user import house_index
+from app.schemas.house import HOUSE_LIST_FIELDS, house_load_options, house_serializer
 from fastapi import HTTPException
-from typing import Optional
+from typing import Optional, Tuple
+import base64
+import binascii
+import json
 
-def house_as_dict(house):
+house_as_dict = house_serializer(HOUSE_LIST_FIELDS)
+MAX_HOUSE_ID = 2 ** 31 - 1
+
+def encode_cursor(house_id: int) -> str:
+    """
+    Encode the last sort key of a page into an opaque cursor.
+    """
+    raw = json.dumps({"id": house_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[int]:
+    """
+    Decode a cursor produced by encode_cursor. An empty cursor starts from the beginning.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        house_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+        # bool is an int subclass; ids outside int4 cannot match a house_id
+        if type(house_id) is not int or not 0 <= house_id <= MAX_HOUSE_ID:
+            raise ValueError
+        return house_id
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def search_query(q: str):
+    """
+    Build the tsquery for a free text search string.
+    """
+    return func.websearch_to_tsquery("english", q)
+
+
+def apply_house_filters(
+    query,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    house_type: Optional[str] = None,
+    furnishing_status: Optional[str] = None,
+    bedrooms: Optional[int] = None,
+    bathrooms: Optional[int] = None,
+    location: Optional[str] = None,
+    category: str = "",
+    q: Optional[str] = None,
+):
+    """
+    Apply the house-list filters to a query.
+    """
+    if min_price is not None:
+        query = query.filter(House.price >= min_price)
+    if max_price is not None:
+        query = query.filter(House.price <= max_price)
+    if house_type:
+        query = query.filter(House.property_type == house_type)
+    if furnishing_status:
+        query = query.filter(House.furnish_status == furnishing_status)
+    if bedrooms is not None:
+        query = query.filter(House.bedroom == bedrooms)
+    if bathrooms is not None:
+        query = query.filter(House.bathroom == bathrooms)
+    if location:
+        query = query.filter(House.location == location)
+    if category:
+        query = query.filter(House.category == category)
+    if q:
+        query = query.filter(House.search_vector.op("@@")(search_query(q)))
+    return query
+
+
+def _use_index(q: Optional[str], location: Optional[str]) -> bool:
+    # The index holds neither the search vector nor the free-text location
+    return house_index.enabled() and not q and not location
+
+
+def _house_list_statement(
+    page: int,
+    page_size: int,
+    min_price: Optional[float],
+    max_price: Optional[float],
+    house_type: Optional[str],
+    furnishing_status: Optional[str],
+    bedrooms: Optional[int],
+    bathrooms: Optional[int],
+    location: Optional[str],
+    category: str,
+    cursor: Optional[str],
+    q: Optional[str],
+    fields: Tuple[str, ...] = HOUSE_LIST_FIELDS,
+):
+    """
+    Build the select for one page of the house list, loading only the columns fields need.
+    When the bitmap index picked the page, also return its house ids in page order.
+    """
+    houses = select(House).options(house_load_options(fields))
+    last_id = decode_cursor(cursor) if cursor is not None else None
+    limit = page_size if cursor is None else page_size + 1
+
+    if _use_index(q, location):
+        index = house_index.get_index()
+        matches = index.match(
+            min_price,
+            max_price,
+            category=category or None,
+            property_type=house_type or None,
+            furnish_status=furnishing_status or None,
+            bedroom=bedrooms,
+            bathroom=bathrooms,
+        )
+        if cursor is None:
+            ids = index.page(matches, (page - 1) * page_size, limit)
+        else:
+            ids = index.page(matches, 0, limit, after_id=last_id)
+        return houses.where(House.house_id.in_(ids)), ids
+
+    stmt = apply_house_filters(
+        houses,
+        min_price, max_price, house_type, furnishing_status, bedrooms, bathrooms, location, category, q
+    )
+    if cursor is None:
+        if q:
+            stmt = stmt.order_by(func.ts_rank(House.search_vector, search_query(q)).desc())
+        return stmt.order_by(House.house_id).offset((page - 1) * page_size).limit(limit), None
+    if last_id is not None:
+        stmt = stmt.filter(House.house_id > last_id)
+    return stmt.order_by(House.house_id).limit(limit), None
+
+
+def _house_list_result(houses, ids, page_size: int, cursor: Optional[str], fields: Tuple[str, ...] = HOUSE_LIST_FIELDS):
+    """
+    Shape the loaded houses into the house-list response.
+    """
+    serialize = house_serializer(fields)
+    if ids is not None:
+        by_id = {house.house_id: house for house in houses}
+        houses = [by_id[house_id] for house_id in ids if house_id in by_id]
+
+    if cursor is None:
+        return [serialize(house) for house in houses]
+
+    has_more = len(houses) > page_size
+    houses = houses[:page_size]
     return {
-        "house_id": house.house_id,
-        "category": house.category,
-        "location": house.location,
-        "address": house.address,
-        "size": house.size,
-        "condition": house.condition,
-        "bedroom": house.bedroom,
-        "toilets": house.toilets,
-        "listed_by": house.listed_by,
-        "property_type": house.property_type,
-        "furnish_status": house.furnish_status,
-        "bathroom": house.bathroom,
-        "facility": house.facility,
-        "description": house.description,
-        "price": house.price,
-        "negotiability": house.negotiability,
-        "parking_space": house.parking_space,
-        "assigned_for": house.assigned_for,
-        "owner": house.owner,
-        "status": house.status,
-        "image_urls": house.image_urls,
-        "video": house.video,
-        "posted_by": house.posted_by
+        "houses": [serialize(house) for house in houses],
+        "next_cursor": encode_cursor(houses[-1].house_id) if has_more else None,
     }
 
-def get_house_list(
+
+async def get_house_list_async(
+    db: AsyncSession,
     page: int = 1,
     page_size: int = 10,
     min_price: Optional[float] = None,
@@ -43,33 +173,101 @@ def get_house_list(
     bathrooms: Optional[int] = None,
     location: Optional[str] = None,
     category: str = "",
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    fields: Tuple[str, ...] = HOUSE_LIST_FIELDS,
 ):
     """
     Get a list of houses with optional filtering.
+
+    When cursor is None the list is paged with page/page_size. Otherwise the
+    page is found with a seek on house_id (an empty cursor means the first page)
+    and the response carries the next_cursor to send back.
+    q runs a full text search; page mode orders the matches by ts_rank.
+    fields limits the response, and the columns loaded, to those fields.
+    With HOUSE_FILTER_INDEX=1 the filters are answered by the in-memory bitmap
+    index and only the final page of houses is loaded from the database;
+    searches and location filters always run in SQL.
+    """
+    if _use_index(q, location):
+        # Building or refreshing the index uses the sync pool, so keep it off the event loop
+        await run_in_threadpool(house_index.get_index)
+    stmt, ids = _house_list_statement(
+        page, page_size, min_price, max_price, house_type, furnishing_status, bedrooms, bathrooms, location, category,
+        cursor, q, fields
+    )
+    houses = (await db.execute(stmt)).scalars().all()
+    return _house_list_result(houses, ids, page_size, cursor, fields)
+
+# Upper bounds of the price buckets shown in the filter sidebar; the last bucket is open-ended
+PRICE_BUCKETS = [50000, 100000, 250000, 500000, 1000000]
+
+FACET_COLUMNS = {
+    "bedroom": House.bedroom,
+    "bathroom": House.bathroom,
+    "property_type": House.property_type,
+    "furnish_status": House.furnish_status,
+    "category": House.category,
+}
+
+
+def price_bucket_label(index: int) -> str:
+    """
+    Human readable label for a price bucket index.
     """
+    lower = 0 if index == 0 else PRICE_BUCKETS[index - 1]
+    if index == len(PRICE_BUCKETS):
+        return f"{lower}+"
+    return f"{lower}-{PRICE_BUCKETS[index]}"
+
+
+def get_house_facets(
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    house_type: Optional[str] = None,
+    furnishing_status: Optional[str] = None,
+    bedrooms: Optional[int] = None,
+    bathrooms: Optional[int] = None,
+    location: Optional[str] = None,
+    category: str = "",
+    q: Optional[str] = None,
+):
+    """
+    Get per-value counts for the house-list filters in a single GROUPING SETS query.
+    """
+    # Bounds are inlined so the CASE in SELECT and GROUP BY is the same expression to Postgres
+    price_bucket = case(
+        *[
+            (House.price < literal_column(str(bound)), literal_column(str(index)))
+            for index, bound in enumerate(PRICE_BUCKETS)
+        ],
+        else_=literal_column(str(len(PRICE_BUCKETS))),
+    )
+    facet_columns = {**FACET_COLUMNS, "price": price_bucket}
+
     db = SessionLocal()
     try:
-        query = db.query(House)
-
-        if min_price is not None:
-            query = query.filter(House.price >= min_price)
-        if max_price is not None:
-            query = query.filter(House.price <= max_price)
-        if house_type:
-            query = query.filter(House.property_type == house_type)
-        if furnishing_status:
-            query = query.filter(House.furnish_status == furnishing_status)
-        if bedrooms is not None:
-            query = query.filter(House.bedroom == bedrooms)
-        if bathrooms is not None:
-            query = query.filter(House.bathroom == bathrooms)
-        if location:
-            query = query.filter(House.location == location)
-        if category:
-            query = query.filter(House.category == category)
-
-        houses = query.offset((page - 1) * page_size).limit(page_size).all()
-        return [house_as_dict(house) for house in houses]
+        query = db.query(
+            *[column.label(name) for name, column in facet_columns.items()],
+            *[func.grouping(column).label(f"g_{name}") for name, column in facet_columns.items()],
+            func.count().label("count"),
+        )
+        query = apply_house_filters(
+            query, min_price, max_price, house_type, furnishing_status, bedrooms, bathrooms, location, category, q
+        )
+        query = query.group_by(func.grouping_sets(*[tuple_(column) for column in facet_columns.values()]))
+
+        facets = {name: {} for name in facet_columns}
+        for row in query.all():
+            mapping = row._mapping
+            for name in facet_columns:
+                # grouping() is 0 for the column this row was grouped by
+                if mapping[f"g_{name}"] == 0:
+                    value = mapping[name]
+                    key = price_bucket_label(value) if name == "price" else str(value)
+                    facets[name][key] = mapping["count"]
+                    break
+        return facets
     finally:
         db.close()
 
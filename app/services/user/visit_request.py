@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models import Invitation, House, Admin
 from fastapi import HTTPException
+from app.services.admin.admin_stats import bump_admin_stats
 
 def save_visit_request(visit_data: dict, user_id: int, db: Session):
     """
@@ -18,6 +19,7 @@ def save_visit_request(visit_data: dict, user_id: int, db: Session):
         status="not seen"
     )
     db.add(invitation)
+    bump_admin_stats(db, house.assigned_for, pending_visits=1)
     db.commit()
     db.refresh(invitation)
     return {"success": True, "message": "Visit request saved successfully", "invitation": invitation}
\ No newline at end of file
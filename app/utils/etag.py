@@ -0,0 +1,19 @@
+from fastapi import Request
+
+
+def _opaque(tag: str) -> str:
+    # If-None-Match uses the weak comparison, so W/"x" and "x" are the same version
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match names etag, or is *, so a 304 can be sent.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = _opaque(etag)
+    return any(_opaque(tag.strip()) == current for tag in header.split(","))
@@ -0,0 +1,129 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils import slow_queries
+
+logger = logging.getLogger(__name__)
+
+# Requests over either threshold are logged
+QUERY_LOG_MAX_QUERIES = int(os.getenv("QUERY_LOG_MAX_QUERIES", "20"))
+QUERY_LOG_MAX_DB_MS = float(os.getenv("QUERY_LOG_MAX_DB_MS", "200"))
+
+
+class QueryStats:
+    """
+    Statements executed and time spent in the database within one request.
+    """
+
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+
+# Threadpool calls copy the context, so sync routes and dependencies add to the request's stats
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_stats_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += duration
+    slow_queries.record(statement, duration)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_stats_start"):
+        connection.info["query_stats_start"].pop()
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that counts SQL statements per request and reports them in the
+    Server-Timing and X-DB-Queries response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                headers.append((b"server-timing", f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries"'.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            if stats.count > QUERY_LOG_MAX_QUERIES or stats.duration_ms > QUERY_LOG_MAX_DB_MS:
+                logger.warning(
+                    "%s %s ran %d queries in %.1f ms",
+                    scope["method"], scope["path"], stats.count, stats.duration_ms,
+                )
+
+
+@contextmanager
+def count_queries():
+    """
+    Count the statements run inside the block, e.g. around a direct service call.
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def assert_query_budget(response, max_queries: int) -> None:
+    """
+    Fail a test when a response reports more queries than its budget.
+    """
+    count = int(response.headers["x-db-queries"])
+    assert count <= max_queries, (
+        f"{response.request.method} {response.request.url.path} ran {count} queries, budget is {max_queries}"
+    )
+
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    """
+    Fail a test when the block runs more than max_queries statements.
+    """
+    with count_queries() as stats:
+        yield stats
+    assert stats.count <= max_queries, f"ran {stats.count} queries, budget is {max_queries}"
@@ -0,0 +1,120 @@
+import atexit
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Statements slower than this are logged individually
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+# Recent durations kept per fingerprint for the percentiles
+SLOW_QUERY_SAMPLES = int(os.getenv("SLOW_QUERY_SAMPLES", "500"))
+# Fingerprints beyond this many are counted together under OTHER_FINGERPRINT
+SLOW_QUERY_MAX_FINGERPRINTS = int(os.getenv("SLOW_QUERY_MAX_FINGERPRINTS", "2000"))
+OTHER_FINGERPRINT = "<other>"
+# When set, the stats are written here as JSON when the process exits
+SLOW_QUERY_DUMP_PATH = os.getenv("SLOW_QUERY_DUMP_PATH")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.$])-?\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a statement so that queries differing only in literals or parameters group together.
+    """
+    normalized = _STRING.sub("?", statement)
+    normalized = _PARAM.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _IN_LIST.sub("(?...)", normalized)
+    return _SPACE.sub(" ", normalized).strip()
+
+
+class FingerprintStats:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SLOW_QUERY_SAMPLES)
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.samples.append(duration)
+
+    def as_dict(self, query: str) -> dict:
+        samples = sorted(self.samples)
+        return {
+            "query": query,
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3),
+            "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+_lock = threading.Lock()
+_stats: Dict[str, FingerprintStats] = {}
+
+
+def record(statement: str, duration: float) -> None:
+    """
+    Add one execution of a statement to its fingerprint's stats, logging it when slower than SLOW_QUERY_MS.
+    Called for every statement by the query_stats cursor hooks.
+    """
+    key = fingerprint(statement)
+    with _lock:
+        stats = _stats.get(key)
+        if stats is None:
+            if len(_stats) >= SLOW_QUERY_MAX_FINGERPRINTS:
+                key = OTHER_FINGERPRINT
+            stats = _stats.get(key)
+            if stats is None:
+                stats = _stats[key] = FingerprintStats()
+        stats.add(duration)
+    if duration * 1000 >= SLOW_QUERY_MS:
+        logger.warning("slow query (%.1f ms): %s", duration * 1000, key)
+
+
+def get_stats(order_by: str = "total_ms", limit: int = 50) -> List[dict]:
+    """
+    Stats per fingerprint, highest first by order_by.
+    """
+    with _lock:
+        rows = [stats.as_dict(query) for query, stats in _stats.items()]
+    rows.sort(key=lambda row: row[order_by], reverse=True)
+    return rows[:limit]
+
+
+def reset_stats() -> None:
+    """
+    Clear all recorded stats.
+    """
+    with _lock:
+        _stats.clear()
+
+
+def dump_stats(path: str) -> None:
+    """
+    Write every fingerprint's stats to path as JSON.
+    """
+    with open(path, "w") as f:
+        json.dump(get_stats(limit=len(_stats)), f, indent=2)
+
+
+if SLOW_QUERY_DUMP_PATH:
+    atexit.register(dump_stats, SLOW_QUERY_DUMP_PATH)
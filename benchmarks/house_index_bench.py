@@ -0,0 +1,89 @@
+"""
+Compare /user/house-list filtering through the in-memory bitmap index against the pure SQL path.
+
+Runs the same random filter combinations through house_service.get_house_list_async with
+HOUSE_FILTER_INDEX off and on, against the database in DATABASE_URL.
+
+    python -m benchmarks.house_index_bench --runs 500 --max-page 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+
+from app.database import AsyncSessionLocal
+from app.services.user import house_index, house_service
+
+CATEGORIES = ["sell", "rent", ""]
+PROPERTY_TYPES = ["apartment", "condominium", None]
+FURNISH_STATUSES = ["furnished", "semi furnished", "unfurnished", None]
+
+
+def random_filters(rng, max_page):
+    min_price = rng.choice([None, 50000, 100000, 250000])
+    return {
+        "page": rng.randint(1, max_page),
+        "page_size": 10,
+        "min_price": min_price,
+        "max_price": rng.choice([None, (min_price or 0) + 400000]),
+        "house_type": rng.choice(PROPERTY_TYPES),
+        "furnishing_status": rng.choice(FURNISH_STATUSES),
+        "bedrooms": rng.choice([None, 1, 2, 3, 4]),
+        "bathrooms": rng.choice([None, 1, 2, 3]),
+        "category": rng.choice(CATEGORIES),
+    }
+
+
+async def run(filters, use_index):
+    os.environ["HOUSE_FILTER_INDEX"] = "1" if use_index else "0"
+    timings = []
+    results = []
+    async with AsyncSessionLocal() as db:
+        for kwargs in filters:
+            start = time.perf_counter()
+            houses = await house_service.get_house_list_async(db, **kwargs)
+            results.append([house["house_id"] for house in houses])
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings, results
+
+
+async def run_both(filters):
+    # One event loop for both runs: pooled asyncpg connections are bound to the loop that opened them
+    sql_timings, sql_results = await run(filters, use_index=False)
+    index_timings, index_results = await run(filters, use_index=True)
+    return sql_timings, sql_results, index_timings, index_results
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{name:<8} mean {statistics.mean(timings):8.2f} ms  p50 {statistics.median(timings):8.2f} ms  p95 {p95:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--max-page", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    filters = [random_filters(rng, args.max_page) for _ in range(args.runs)]
+
+    os.environ["HOUSE_FILTER_INDEX"] = "1"
+    start = time.perf_counter()
+    house_index.get_index()
+    print(f"index build {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    sql_timings, sql_results, index_timings, index_results = asyncio.run(run_both(filters))
+    report("sql", sql_timings)
+    report("index", index_timings)
+
+    mismatches = sum(1 for a, b in zip(sql_results, index_results) if a != b)
+    print(f"result mismatches: {mismatches}/{len(filters)}")
+
+
+if __name__ == "__main__":
+    main()
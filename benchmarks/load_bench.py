@@ -0,0 +1,83 @@
+"""
+Load test the read-heavy routes and report requests per second and latency percentiles.
+
+Start the app (for example `uvicorn main:app --workers 1`) and point this at it. Run it
+once against a build with the sync routes and once with the async ones to compare.
+
+    python -m benchmarks.load_bench --url http://localhost:8000 --concurrency 64 --duration 30
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/user/house-list?page=1&page_size=10",
+    "/user/house/1",
+    "/user/vip-houses",
+    "/user/locations",
+]
+
+
+async def worker(client, paths, deadline, latencies, errors, offset):
+    index = offset
+    while time.perf_counter() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 500:
+                errors[path] = errors.get(path, 0) + 1
+        except httpx.HTTPError:
+            errors[path] = errors.get(path, 0) + 1
+            continue
+        latencies.setdefault(path, []).append((time.perf_counter() - start) * 1000)
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run(args):
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    latencies, errors = {}, {}
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            worker(client, args.path, deadline, latencies, errors, offset) for offset in range(args.concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"{total} requests in {elapsed:.1f}s with concurrency {args.concurrency}: {total / elapsed:.1f} req/s")
+    for path in args.path:
+        values = latencies.get(path, [])
+        if not values:
+            print(f"{path}: no successful requests, {errors.get(path, 0)} errors")
+            continue
+        print(
+            f"{path}: {len(values) / elapsed:8.1f} req/s  p50 {statistics.median(values):7.1f} ms  "
+            f"p99 {percentile(values, 0.99):7.1f} ms  errors {errors.get(path, 0)}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", help="Route to request; repeat for several")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--token", help="Bearer token for authenticated routes such as /admin/houselist")
+    args = parser.parse_args()
+    args.path = args.path or DEFAULT_PATHS
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compare serializing a page of houses through the previous path and the compiled serializer.
+
+The old path builds each dict attribute by attribute and encodes it the way FastAPI's default
+JSONResponse does (jsonable_encoder, then json.dumps). The new path uses house_serializer and
+orjson, as house_response does. Houses are built in memory, so no database is needed.
+
+    python -m benchmarks.serializer_bench --houses 100 --runs 2000
+"""
+import argparse
+import json
+import statistics
+import time
+from decimal import Decimal
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from app.models import House
+from app.schemas.house import HOUSE_LIST_FIELDS, serialize_houses
+
+
+def make_houses(count):
+    return [
+        House(
+            house_id=house_id, category="rent", area_code=1, location="Bole", address=f"{house_id} Africa Avenue",
+            size=120, condition="newly built", bedroom=3, toilets=2, bathroom=2, listed_by="agent",
+            property_type="apartment", furnish_status="furnished", facility='["wifi", "parking"]',
+            description="Bright three bedroom apartment close to the airport and shops.",
+            price=Decimal("25000.00"), negotiability="not", parking_space=True, assigned_for=1, owner=1,
+            status="available", image_urls=[f"media/house_photos/{house_id}_front.jpg", f"media/house_photos/{house_id}_back.jpg"],
+            video=None, posted_by=None,
+        )
+        for house_id in range(1, count + 1)
+    ]
+
+
+def old_path(houses):
+    content = [
+        {
+            "house_id": house.house_id,
+            "category": house.category,
+            "location": house.location,
+            "address": house.address,
+            "size": house.size,
+            "condition": house.condition,
+            "bedroom": house.bedroom,
+            "toilets": house.toilets,
+            "listed_by": house.listed_by,
+            "property_type": house.property_type,
+            "furnish_status": house.furnish_status,
+            "bathroom": house.bathroom,
+            "facility": house.facility,
+            "description": house.description,
+            "price": house.price,
+            "negotiability": house.negotiability,
+            "parking_space": house.parking_space,
+            "assigned_for": house.assigned_for,
+            "owner": house.owner,
+            "status": house.status,
+            "image_urls": house.image_urls,
+            "video": house.video,
+            "posted_by": house.posted_by,
+        }
+        for house in houses
+    ]
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def new_path(houses):
+    return orjson.dumps(serialize_houses(houses, HOUSE_LIST_FIELDS))
+
+
+def measure(function, houses, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function(houses)
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--houses", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=1000)
+    args = parser.parse_args()
+
+    houses = make_houses(args.houses)
+    for name, function in (("old", old_path), ("new", new_path)):
+        function(houses)  # Warm up caches such as the compiled serializer
+        timings = measure(function, houses, args.runs)
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"{name:<4} mean {statistics.mean(timings):7.3f} ms  p50 {statistics.median(timings):7.3f} ms  p95 {p95:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Measure worker cold start: importing the app and serving its first request, in fresh processes.
+
+Each run starts a new interpreter, times `import main` and a first request to a route that
+does not need the database, then exits. Run it on builds before and after a change to compare.
+
+    python -m benchmarks.startup_bench --runs 20
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+TestClient(main.app).get("/user/")
+served = time.perf_counter()
+print(json.dumps({"import": (imported - start) * 1000, "first_request": (served - start) * 1000}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    results = {"import": [], "first_request": []}
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, "-c", CHILD], capture_output=True, text=True, check=True)
+        timings = json.loads(output.stdout.strip().splitlines()[-1])
+        for name, value in timings.items():
+            results[name].append(value)
+
+    for name, values in results.items():
+        values.sort()
+        print(
+            f"{name:<14} median {statistics.median(values):8.1f} ms  "
+            f"min {values[0]:8.1f} ms  max {values[-1]:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
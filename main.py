@@ -1,10 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 from app.routers.admin_routes import router as admin_router
 from app.routers.user_routes import router as user_router
 from app.routers.super_admin_routes import router as super_admin_routes
 from app.routers.auth import router as auth_router
+from app.routers.media_routes import router as media_router
 from fastapi.middleware.cors import CORSMiddleware
-app = FastAPI()
+from app.utils.query_stats import QueryStatsMiddleware
+from app.services.jobs import job_runner
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Every worker runs jobs; only the advisory lock holder schedules the periodic ones
+    job_runner.start()
+    yield
+    # stop() joins the worker threads, so it runs off the event loop
+    await run_in_threadpool(job_runner.stop)
+
+
+app = FastAPI(lifespan=lifespan)
 
 
 app.add_middleware(
@@ -15,8 +31,11 @@ app.add_middleware(
     allow_headers=["*"],  
 )
 
+app.add_middleware(QueryStatsMiddleware)
+
 app.include_router(admin_router)
 app.include_router(user_router)
 app.include_router(super_admin_routes)
 app.include_router(auth_router)
+app.include_router(media_router)
 